@@ -6,44 +6,126 @@ Takes a list of pre-scored events and:
   - applies an "editorial fit" judgment
   - optionally re-prioritizes them
   - returns a smaller, ordered subset with inline AI metadata
+
+Responses are cached on disk (exact + near-match on the candidate set) so
+repeat runs within the TTL skip the LLM call entirely.
 """
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import heapq
 import json
+import logging
 import os
-from typing import Any, Dict, List
+import random
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Set, Tuple
+
+import fastjson
+
+if TYPE_CHECKING:
+    # The SDK (httpx, pydantic, anyio, ...) is imported lazily where it's used,
+    # so importing this module stays cheap when the AI pass is skipped.
+    from openai import AsyncOpenAI
+
+
+logger = logging.getLogger(__name__)
+
+# Responses are cached on disk so re-running a window with the same (or a
+# nearly identical) candidate list doesn't pay for another LLM round-trip.
+AI_CACHE_DIR = Path(".ai_cache")
+AI_CACHE_TTL_SECONDS = 12 * 3600  # 12 hours
+# Minimum Jaccard similarity between candidate id sets for a near-match hit.
+AI_CACHE_SIMILARITY = 0.9
+# Near-match lookups only parse this many of the newest unexpired entries.
+AI_CACHE_MAX_SCAN = 32
 
-from openai import OpenAI
 
+# Upper bound on in-flight chat completions when windows are split across requests.
+AI_MAX_CONCURRENT = 8
+# Keep-alive pool shared by every request (and retry) within one refinement run.
+AI_HTTP_MAX_CONNECTIONS = 16
 
-def _get_openai_client() -> OpenAI | None:
+# Candidates sent per window: the best AI_HEAD_FACTOR * top_k by heuristic score,
+# plus top_k "wildcards" sampled from the rest so the model can still surprise us.
+AI_HEAD_FACTOR = 3
+
+# Requests with barely more candidates than picks are near-trivial; they always
+# go to the small model, whatever OPENAI_MODEL is set to.
+AI_SMALL_MODEL = "gpt-4o-mini"
+
+# Structured-output limits: reasons are capped in the prompt/schema and the
+# completion gets a token budget proportional to the number of picks requested.
+AI_REASON_MAX_CHARS = 180  # keep in sync with SYSTEM_PROMPT
+AI_TOKENS_PER_SELECTION = 90
+
+# Retry policy for transient OpenAI errors (rate limits, connection drops, timeouts).
+AI_MAX_ATTEMPTS = 4
+AI_RETRY_BASE_SECONDS = 1.0
+AI_RETRY_MAX_SECONDS = 30.0
+
+
+def _get_async_client() -> AsyncOpenAI | None:
+    """
+    Build the client used for one refinement run. All requests in the run
+    share its connection pool, so only the first one pays for the TLS
+    handshake. The caller closes it when the run is done.
+    """
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
-        print("⚠  OPENAI_API_KEY not set, skipping AI refinement.")
+        logger.warning("⚠  OPENAI_API_KEY not set, skipping AI refinement.")
         return None
-    return OpenAI(api_key=api_key)
+
+    import httpx
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+    http_client = DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=AI_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=AI_HTTP_MAX_CONNECTIONS,
+        )
+    )
+    # _call_with_retry owns the retry policy; SDK retries would multiply with it
+    return AsyncOpenAI(api_key=api_key, http_client=http_client, max_retries=0)
 
 
 def _summarize_event_for_ai(ev: Dict[str, Any]) -> Dict[str, Any]:
     """
     Strip the event down to the essentials so the model can reason
     without us blowing through context.
+
+    Keys are abbreviated to keep the prompt small; SYSTEM_PROMPT carries
+    the legend. State, country and window are left out: every candidate is
+    in CA/US, and the window is given by the list the candidate sits in.
+
+    The summary is memoized on the event itself under "_ai_summary", so an
+    event shared by several windows or requests is only summarized once.
+    Drop that key if you change an event's fields after summarizing it.
     """
-    return {
-        "id": ev.get("id"),
-        "name": ev.get("name"),
-        "primary_artist": ev.get("primary_artist") or ev.get("name"),
-        "venue_name": ev.get("venue_name"),
-        "city": ev.get("city"),
-        "state": ev.get("state"),
-        "country": ev.get("country"),
-        "local_date": ev.get("local_date"),
-        "window": ev.get("window"),
-        "score": round(float(ev.get("score", 0.0)), 3),
+    cached = ev.get("_ai_summary")
+    if cached is not None:
+        return cached
+
+    summary = {
+        "i": ev.get("id"),
+        "n": ev.get("name"),
+        "a": ev.get("primary_artist") or ev.get("name"),
+        "v": ev.get("venue_name"),
+        "c": ev.get("city"),
+        "d": ev.get("local_date"),
+        "z": round(float(ev.get("score", 0.0)), 3),
     }
+    ev["_ai_summary"] = summary
+    return summary
 
 
+# Static rubric, always sent as the first message. Keep it free of per-call
+# values (window labels, top_k, dates) so the prompt prefix stays byte-identical
+# across requests and OpenAI's automatic prompt caching can reuse it; everything
+# volatile belongs in the user message.
 SYSTEM_PROMPT = """
 You are the lead editor for a Bay Area live-music publication called "InYourBones".
 Your job is to curate the most editorially interesting shows from a pre-scored list
@@ -57,144 +139,203 @@ Editorial priorities (rough):
   very small bar gigs with no clear hook.
 - Ignore anything that is clearly *not* a music event (e.g. pure comedy, sports).
 
-You will be given:
-- a time window label (e.g. "short_term" or "far_out")
-- a list of candidate events, already scored from 0–1 by a heuristic
-- a desired top_k size
+You will be given a JSON object with a "windows" list. Each window has:
+- a time window "label" (e.g. "short_term" or "far_out")
+- a desired "top_k" size
+- a list of "candidates", already scored from 0–1 by a heuristic
+
+Candidate keys are abbreviated:
+  i=id, n=event name, a=primary artist, v=venue, c=city (all in CA, US),
+  d=local date, z=heuristic score
 
 You must return a JSON object of the form:
 {
-  "selections": [
-    {
-      "id": "<Ticketmaster event id>",
-      "keep": true,
-      "priority": <integer 1-10>,
-      "reason": "<1-2 sentence editorial justification>"
-    },
+  "selections": {
+    "<window label>": [
+      {
+        "id": "<Ticketmaster event id, copied from the candidate's i>",
+        "keep": true,
+        "priority": <integer 1-10>,
+        "reason": "<1-2 sentence editorial justification>"
+      },
+      ...
+    ],
     ...
-  ]
+  }
 }
 
 Rules:
 - ALWAYS respond with valid JSON matching the schema above. No extra keys, no comments.
-- The selections array MUST be sorted from highest to lowest priority.
+- Include one key per window label you were given, even if its list is empty.
+- Only select events from the candidates of the window they are listed under.
+- Each window's selections array MUST be sorted from highest to lowest priority.
 - "priority" should roughly reflect both the heuristics score and editorial excitement.
-- You MAY drop events entirely by setting "keep": false or by omitting them,
-  but the caller will cap the final list at top_k anyway.
+- List at most top_k selections per window. Leave out events you wouldn't feature
+  rather than listing them with "keep": false.
 - Favor a varied mix of genres and venues when possible, not 20 shows at the same arena.
-- Keep reasons short, concrete, and specific (no generic "great show" fluff).
+- Keep reasons short (under 180 characters), concrete, and specific
+  (no generic "great show" fluff).
 """.strip()
 
 
-def refine_top_events_with_ai(
-    events: List[Dict[str, Any]],
-    window_label: str,
-    top_k: int = 20,
-    max_items: int = 200,
-    debug: bool = False,
-) -> List[Dict[str, Any]]:
+def _cache_key(model: str, payload: Dict[str, Any]) -> str:
     """
-    Given a list of normalized + scored events for a single window,
-    call the LLM to re-rank and optionally filter them.
+    Exact-match key: SHA-256 of the canonicalized request (model, prompt, payload).
+    """
+    material = {"model": model, "system": SYSTEM_PROMPT, "payload": payload}
+    return hashlib.sha256(fastjson.dumpb(material, sort_keys=True)).hexdigest()
 
-    Returns a list of events (subset of the input) with added fields:
-        - ai_priority: int | None
-        - ai_reason: str | None
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def _fresh_cache_files(now: float) -> List[Path]:
+    """
+    Delete expired AI cache entries and return the rest, newest first.
     """
-    if not events:
-        return []
+    fresh: List[Tuple[float, Path]] = []
+    for path in AI_CACHE_DIR.glob("*.json"):
+        try:
+            mtime = path.stat().st_mtime
+            if now - mtime > AI_CACHE_TTL_SECONDS:
+                path.unlink()
+                continue
+        except OSError:
+            continue
+        fresh.append((mtime, path))
+    fresh.sort(key=lambda item: item[0], reverse=True)
+    return [path for _, path in fresh]
 
-    client = _get_openai_client()
-    if client is None:
-        # No key: just fall back to heuristic top_k
-        return events[:top_k]
-
-    # Truncate for context safety
-    slice_events = events[: max_items]
-    payload = {
-        "window": window_label,
-        "top_k": top_k,
-        "candidates": [_summarize_event_for_ai(e) for e in slice_events],
-    }
 
-    if debug:
-        print(f"→ Sending {len(slice_events)} events to AI for window='{window_label}', top_k={top_k}")
+def _load_cached_selections(
+    key: str,
+    model: str,
+    fingerprint: Dict[str, Dict[str, Any]],
+) -> Dict[str, Any] | None:
+    """
+    Two-tier lookup:
+      1. exact match on the request key
+      2. near match: same model and windows with the same top_k, where every
+         window's candidate id set has a Jaccard similarity of at least
+         AI_CACHE_SIMILARITY (best worst-window match wins); only the
+         AI_CACHE_MAX_SCAN newest entries are considered, and expired ones
+         are deleted along the way
 
-    try:
-        resp = client.chat.completions.create(
-            model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
-            response_format={"type": "json_object"},
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {
-                    "role": "user",
-                    "content": json.dumps(payload, ensure_ascii=False),
-                },
-            ],
-            temperature=0.3,
-            timeout=60.0,  # 60 second timeout
-        )
-        raw = resp.choices[0].message.content
-        if debug:
-            print("✓ AI response received.")
-    except Exception as e:
-        print(f"⚠ AI refinement failed: {e}")
-        print(f"  Falling back to top {top_k} by heuristic score only")
-        return events[:top_k]
+    `fingerprint` maps window label -> {"top_k": int, "ids": set of ids}.
+    Returns the cached 'selections' mapping, or None on a miss.
+    """
+    if not AI_CACHE_DIR.exists():
+        return None
+
+    now = time.time()
+    labels = ",".join(fingerprint)
+
+    def _read_fresh(path: Path) -> Dict[str, Any] | None:
+        try:
+            if now - path.stat().st_mtime > AI_CACHE_TTL_SECONDS:
+                return None
+            entry = fastjson.loads(path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        return entry if isinstance(entry, dict) else None
+
+    exact = _read_fresh(AI_CACHE_DIR / f"{key}.json")
+    if exact is not None:
+        logger.info("→ [ai cache hit] windows=%s", labels)
+        return exact.get("selections")
+
+    best: Dict[str, Any] | None = None
+    best_sim = AI_CACHE_SIMILARITY
+    for path in _fresh_cache_files(now)[:AI_CACHE_MAX_SCAN]:
+        entry = _read_fresh(path)
+        if entry is None:
+            continue
+        if entry.get("model") != model:
+            continue
+        cached_windows = entry.get("windows") or {}
+        if not isinstance(cached_windows, dict) or set(cached_windows) != set(fingerprint):
+            continue
+        sim = 1.0
+        for label, fp in fingerprint.items():
+            cached = cached_windows[label] or {}
+            if cached.get("top_k") != fp["top_k"]:
+                sim = 0.0
+                break
+            sim = min(sim, _jaccard(fp["ids"], set(cached.get("ids") or [])))
+        if sim >= best_sim:
+            best, best_sim = entry, sim
+
+    if best is not None:
+        logger.info("→ [ai cache near-hit] windows=%s similarity=%.3f", labels, best_sim)
+        return best.get("selections")
+    return None
 
+
+def _save_cached_selections(
+    key: str,
+    model: str,
+    fingerprint: Dict[str, Dict[str, Any]],
+    selections: Dict[str, Any],
+) -> None:
+    AI_CACHE_DIR.mkdir(exist_ok=True, parents=True)
+    entry = {
+        "model": model,
+        "windows": {
+            label: {"top_k": fp["top_k"], "ids": sorted(fp["ids"])}
+            for label, fp in fingerprint.items()
+        },
+        "selections": selections,
+    }
     try:
-        data = json.loads(raw)
-    except Exception as e:
-        print(f"⚠ Failed to parse AI JSON: {e}")
-        if debug:
-            print("⚠ Raw AI response content:")
-            print(raw)
-        return events[:top_k]
-
-    selections = data.get("selections") or []
-    if not isinstance(selections, list):
-        print("⚠ AI JSON missing 'selections' list, falling back.")
-        return events[:top_k]
-
-    # Build lookup from event id -> original event
+        (AI_CACHE_DIR / f"{key}.json").write_bytes(fastjson.dumpb(entry))
+    except OSError as e:
+        logger.warning("⚠ Failed to write AI cache: %s", e)
+    # Exact hits skip the near-match scan, so expired entries are also pruned here
+    _fresh_cache_files(time.time())
+
+
+def _apply_selections(
+    events: List[Dict[str, Any]],
+    selections: List[Any],
+    top_k: int,
+) -> List[Dict[str, Any]]:
+    """
+    Map the model's selections for one window back onto the source events,
+    topping up with heuristic-ordered leftovers if it returned too few.
+    """
+    # One pass: id -> original event, plus ids in heuristic order for top-up
     by_id: Dict[str, Dict[str, Any]] = {}
+    order: List[str] = []
     for ev in events:
         eid = ev.get("id")
-        if eid:
+        if eid and eid not in by_id:
             by_id[eid] = ev
+            order.append(eid)
 
-    chosen: List[Dict[str, Any]] = []
-    seen_ids = set()
-
+    # First kept selection per known id wins, in the model's order
+    seen: Dict[str, Dict[str, Any]] = {}
     for item in selections:
-        if not isinstance(item, dict):
-            continue
         eid = item.get("id")
-        if not eid or eid in seen_ids:
-            continue
-        keep = item.get("keep", True)
-        if not keep:
+        if not eid or eid in seen or eid not in by_id or not item.get("keep", True):
             continue
-        src = by_id.get(eid)
-        if not src:
-            continue
-        ev = dict(src)  # shallow copy
-        ev["ai_priority"] = item.get("priority")
-        ev["ai_reason"] = item.get("reason")
-        chosen.append(ev)
-        seen_ids.add(eid)
-        if len(chosen) >= top_k:
+        seen[eid] = item
+        if len(seen) >= top_k:
             break
 
+    chosen: List[Dict[str, Any]] = [
+        {**by_id[eid], "ai_priority": item.get("priority"), "ai_reason": item.get("reason")}
+        for eid, item in seen.items()
+    ]
+
     # If AI returned too few, top up with heuristic-ordered leftovers
     if len(chosen) < top_k:
-        already = set(seen_ids)
-        for ev in events:
-            eid = ev.get("id")
-            if not eid or eid in already:
+        for eid in order:
+            if eid in seen:
                 continue
-            chosen.append(ev)
-            already.add(eid)
+            chosen.append(by_id[eid])
             if len(chosen) >= top_k:
                 break
 
@@ -205,5 +346,436 @@ def refine_top_events_with_ai(
             ev.get("score") or 0.0,
         )
 
-    chosen.sort(key=sort_key, reverse=True)
-    return chosen[:top_k]
+    # The model is asked to sort by priority, so usually there's nothing to do.
+    keys = [sort_key(ev) for ev in chosen]
+    if all(keys[i] >= keys[i + 1] for i in range(len(keys) - 1)):
+        return chosen[:top_k]
+    # Rank indices by the keys we already built instead of re-deriving them.
+    order = heapq.nlargest(top_k, range(len(chosen)), key=keys.__getitem__)
+    return [chosen[i] for i in order]
+
+
+class _SelectionScanner:
+    """
+    Incremental scanner for a streamed response of the form
+        {"selections": {"<label>": [{...}, {...}], ...}}
+
+    feed() takes the next chunk of text and returns (label, item) pairs for
+    every selection object completed so far, so results can be consumed
+    before the model finishes generating.
+    """
+
+    def __init__(self) -> None:
+        self.labels: List[str] = []
+        self.saw_selections = False
+        self._chunks: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string: List[str] = []
+        self._last_key: str | None = None
+        self._section: str | None = None
+        self._label: str | None = None
+        self._obj: List[str] | None = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        self._chunks.append(text)
+        out: List[Tuple[str, Any]] = []
+        for ch in text:
+            if self._obj is not None:
+                self._obj.append(ch)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth <= 2:
+                        self._last_key = json.loads('"' + "".join(self._string) + '"')
+                    continue
+                if self._depth <= 2:
+                    self._string.append(ch)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string = []
+            elif ch == "{" or ch == "[":
+                self._depth += 1
+                if self._depth == 2:
+                    self._section = self._last_key
+                    if self._section == "selections":
+                        self.saw_selections = True
+                elif self._depth == 3 and self._section == "selections":
+                    self._label = self._last_key
+                    if self._label is not None and self._label not in self.labels:
+                        self.labels.append(self._label)
+                elif self._depth == 4 and ch == "{" and self._label is not None:
+                    self._obj = ["{"]
+            elif ch == "}" or ch == "]":
+                if self._depth == 4 and self._obj is not None:
+                    try:
+                        out.append((self._label, fastjson.loads("".join(self._obj))))
+                    except ValueError:
+                        pass
+                    self._obj = None
+                elif self._depth == 3:
+                    self._label = None
+                elif self._depth == 2:
+                    self._section = None
+                self._depth -= 1
+        return out
+
+
+def _pick_model(n_events: int, top_k: int) -> str:
+    if n_events < 2 * top_k:
+        return AI_SMALL_MODEL
+    return os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+
+
+def _response_format(windows: List[Tuple[str, List[Dict[str, Any]], int]]) -> Dict[str, Any]:
+    """
+    Strict JSON schema for one request: a "selections" object with one
+    array per window label, each capped at that window's top_k.
+    """
+    selection = {
+        "type": "object",
+        "properties": {
+            "id": {"type": "string"},
+            "keep": {"type": "boolean"},
+            "priority": {"type": "integer", "minimum": 1, "maximum": 10},
+            "reason": {
+                "type": "string",
+                "description": f"At most {AI_REASON_MAX_CHARS} characters.",
+            },
+        },
+        "required": ["id", "keep", "priority", "reason"],
+        "additionalProperties": False,
+    }
+    per_window = {
+        label: {"type": "array", "maxItems": top_k, "items": selection}
+        for label, _, top_k in windows
+    }
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "selections",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "selections": {
+                        "type": "object",
+                        "properties": per_window,
+                        "required": list(per_window),
+                        "additionalProperties": False,
+                    },
+                },
+                "required": ["selections"],
+                "additionalProperties": False,
+            },
+        },
+    }
+
+
+def _select_candidates(
+    events: List[Dict[str, Any]],
+    label: str,
+    top_k: int,
+    max_items: int,
+) -> List[Dict[str, Any]]:
+    """
+    Pick the events worth showing the model for one window: the top
+    AI_HEAD_FACTOR * top_k by heuristic score plus up to top_k sampled from
+    the remainder, capped at max_items.
+
+    The sample is seeded by the window label so an unchanged event list
+    yields an identical payload (and hits the exact-match cache).
+    """
+    head_size = min(AI_HEAD_FACTOR * top_k, max_items)
+    if len(events) <= head_size:
+        return events[:max_items]
+
+    def score(ev: Dict[str, Any]) -> float:
+        return ev.get("score") or 0.0
+
+    head = heapq.nlargest(head_size, events, key=score)
+    head_ids = {id(e) for e in head}
+    rest = [e for e in events if id(e) not in head_ids]
+
+    tail_size = min(top_k, len(rest), max_items - head_size)
+    rng = random.Random(label)
+    picks = sorted(rng.sample(range(len(rest)), k=tail_size))
+    return head + [rest[i] for i in picks]
+
+
+def _log_usage(resp: Any, level: int) -> None:
+    """
+    Report prompt tokens and how many were served from OpenAI's prompt cache.
+    """
+    usage = getattr(resp, "usage", None)
+    if usage is None:
+        return
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None) or 0
+    logger.log(level, "  Prompt tokens: %s (cached: %s)", usage.prompt_tokens, cached)
+
+
+async def _call_with_retry(client: AsyncOpenAI, **kwargs: Any) -> Any:
+    """
+    Create a chat completion, retrying transient errors with exponential
+    backoff + jitter. Other errors (and the last transient one) propagate.
+    """
+    from openai import APIConnectionError, APITimeoutError, RateLimitError
+
+    for attempt in range(AI_MAX_ATTEMPTS):
+        try:
+            return await client.chat.completions.create(**kwargs)
+        except (RateLimitError, APIConnectionError, APITimeoutError) as e:
+            if attempt == AI_MAX_ATTEMPTS - 1:
+                raise
+            delay = min(AI_RETRY_BASE_SECONDS * 2 ** attempt, AI_RETRY_MAX_SECONDS) + random.random()
+            logger.warning("⚠ Transient AI error (%s), retrying in %.1fs", type(e).__name__, delay)
+            await asyncio.sleep(delay)
+
+
+async def _arefine_request(
+    client: AsyncOpenAI,
+    sem: asyncio.Semaphore,
+    windows: List[Tuple[str, List[Dict[str, Any]], int]],
+    max_items: int,
+    debug: bool,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Refine one group of non-empty windows with a single chat completion.
+    Falls back to heuristic top_k for the whole group on request/parse errors.
+    """
+    # Diagnostics go out at DEBUG, or INFO when the caller asked for debug output.
+    level = logging.INFO if debug else logging.DEBUG
+
+    def fallback() -> Dict[str, List[Dict[str, Any]]]:
+        return {label: events[:top_k] for label, events, top_k in windows}
+
+    # Trim each window to its strongest candidates (plus a few wildcards)
+    payload_windows = []
+    fingerprint: Dict[str, Dict[str, Any]] = {}
+    for label, events, top_k in windows:
+        slice_events = _select_candidates(events, label, top_k, max_items)
+        payload_windows.append(
+            {
+                "label": label,
+                "top_k": top_k,
+                "candidates": [_summarize_event_for_ai(e) for e in slice_events],
+            }
+        )
+        fingerprint[label] = {
+            "top_k": top_k,
+            "ids": {str(e.get("id")) for e in slice_events if e.get("id")},
+        }
+    payload = {"windows": payload_windows}
+
+    model = _pick_model(
+        sum(len(w["candidates"]) for w in payload_windows),
+        sum(top_k for _, _, top_k in windows),
+    )
+    cache_key = _cache_key(model, payload)
+
+    selections = _load_cached_selections(cache_key, model, fingerprint)
+    if selections is None:
+        if logger.isEnabledFor(level):
+            sizes = ", ".join(f"{w['label']}={len(w['candidates'])}" for w in payload_windows)
+            logger.log(level, "→ Sending events to AI in one request (%s)", sizes)
+
+        scanner = _SelectionScanner()
+        streamed: Dict[str, List[Any]] = {}
+        try:
+            async with sem:
+                stream = await _call_with_retry(
+                    client,
+                    model=model,
+                    response_format=_response_format(windows),
+                    max_tokens=AI_TOKENS_PER_SELECTION * sum(top_k for _, _, top_k in windows) + 100,
+                    messages=[
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {
+                            "role": "user",
+                            "content": fastjson.dumps(payload),
+                        },
+                    ],
+                    temperature=0.3,
+                    timeout=60.0,  # 60 second timeout
+                    stream=True,
+                    stream_options={"include_usage": True},
+                )
+                try:
+                    async for chunk in stream:
+                        # Usage arrives in the final chunk (include_usage)
+                        if getattr(chunk, "usage", None):
+                            _log_usage(chunk, level)
+                        if not chunk.choices:
+                            continue
+                        delta = chunk.choices[0].delta.content
+                        if not delta:
+                            continue
+                        for label, item in scanner.feed(delta):
+                            if label in fingerprint:
+                                streamed.setdefault(label, []).append(item)
+                finally:
+                    await stream.close()
+            logger.log(level, "✓ AI response received.")
+        except Exception as e:
+            logger.warning("⚠ AI refinement failed: %s", e)
+            logger.warning("  Falling back to top_k by heuristic score only")
+            return fallback()
+
+        if not scanner.saw_selections:
+            logger.warning("⚠ AI JSON missing 'selections' mapping, falling back.")
+            logger.log(level, "⚠ Raw AI response content:\n%s", scanner.text)
+            return fallback()
+
+        selections = {label: streamed.get(label, []) for label in scanner.labels}
+        _save_cached_selections(cache_key, model, fingerprint, selections)
+
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    for label, events, top_k in windows:
+        window_selections = selections.get(label)
+        if not isinstance(window_selections, list):
+            logger.warning("⚠ AI JSON missing selections for window '%s', falling back.", label)
+            results[label] = events[:top_k]
+            continue
+        results[label] = _apply_selections(events, window_selections, top_k)
+    return results
+
+
+async def arefine_all_windows_with_ai(
+    windows: List[Tuple[str, List[Dict[str, Any]], int]],
+    max_items: int = 200,
+    windows_per_request: int | None = None,
+    max_concurrent: int = AI_MAX_CONCURRENT,
+    debug: bool = False,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Refine several windows with the LLM.
+
+    `windows` is a list of (window_label, events, top_k) tuples, where each
+    events list is normalized + scored and ordered by heuristic score.
+
+    Each window sends the model at most AI_HEAD_FACTOR * top_k of its
+    highest-scored events plus top_k sampled from the rest (never more than
+    max_items), rather than the first max_items. Events outside that set can
+    still appear via the heuristic top-up.
+
+    By default all windows go out in a single request. Pass
+    `windows_per_request` to split them into groups instead; the groups are
+    sent concurrently (at most `max_concurrent` in flight).
+
+    Returns a dict of window_label -> refined events (subset of the input)
+    with added fields:
+        - ai_priority: int | None
+        - ai_reason: str | None
+    Windows with no more than top_k events skip the model entirely, and
+    windows the model doesn't answer for fall back to heuristic top_k.
+    """
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    pending: List[Tuple[str, List[Dict[str, Any]], int]] = []
+    for label, events, top_k in windows:
+        if len(events) <= top_k:
+            # Selection is forced (or there's nothing to select): skip the LLM.
+            results[label] = events[:top_k]
+        else:
+            pending.append((label, events, top_k))
+    if not pending:
+        return results
+
+    client = _get_async_client()
+    if client is None:
+        # No key: just fall back to heuristic top_k
+        for label, events, top_k in pending:
+            results[label] = events[:top_k]
+        return {label: results[label] for label, _, _ in windows}
+
+    group_size = windows_per_request or len(pending)
+    groups = [pending[i : i + group_size] for i in range(0, len(pending), group_size)]
+    sem = asyncio.Semaphore(max_concurrent)
+
+    try:
+        group_results = await asyncio.gather(
+            *(_arefine_request(client, sem, group, max_items, debug) for group in groups)
+        )
+    finally:
+        await client.close()
+
+    for group_result in group_results:
+        results.update(group_result)
+    return {label: results[label] for label, _, _ in windows}
+
+
+def refine_all_windows_with_ai(
+    windows: List[Tuple[str, List[Dict[str, Any]], int]],
+    max_items: int = 200,
+    windows_per_request: int | None = None,
+    debug: bool = False,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Synchronous entry point for arefine_all_windows_with_ai.
+    """
+    return asyncio.run(
+        arefine_all_windows_with_ai(
+            windows,
+            max_items=max_items,
+            windows_per_request=windows_per_request,
+            debug=debug,
+        )
+    )
+
+
+async def arefine_top_events_with_ai(
+    events: List[Dict[str, Any]],
+    window_label: str,
+    top_k: int = 20,
+    max_items: int = 200,
+    debug: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Async single-window refinement; see refine_top_events_with_ai.
+    """
+    results = await arefine_all_windows_with_ai(
+        [(window_label, events, top_k)],
+        max_items=max_items,
+        debug=debug,
+    )
+    return results[window_label]
+
+
+def refine_top_events_with_ai(
+    events: List[Dict[str, Any]],
+    window_label: str,
+    top_k: int = 20,
+    max_items: int = 200,
+    debug: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Given a list of normalized + scored events for a single window,
+    call the LLM to re-rank and optionally filter them.
+
+    Thin wrapper around refine_all_windows_with_ai for a single window.
+
+    Returns a list of events (subset of the input) with added fields:
+        - ai_priority: int | None
+        - ai_reason: str | None
+    """
+    return asyncio.run(
+        arefine_top_events_with_ai(
+            events,
+            window_label,
+            top_k=top_k,
+            max_items=max_items,
+            debug=debug,
+        )
+    )
@@ -0,0 +1,52 @@
+"""
+fastjson.py
+
+JSON helpers that use orjson when it's installed and fall back to the
+standard library otherwise.
+
+Both paths produce the same UTF-8 output (compact by default, or 2-space
+indented; no ASCII escaping), so callers can switch freely.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson isn't installed
+    orjson = None
+
+
+def dumpb(obj: Any, sort_keys: bool = False, indent: bool = False) -> bytes:
+    """
+    Serialize to UTF-8 bytes; compact unless `indent` asks for 2-space indentation.
+    """
+    if orjson is not None:
+        option = 0
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(
+            obj, sort_keys=sort_keys, indent=2, ensure_ascii=False
+        ).encode("utf-8")
+    return json.dumps(
+        obj, sort_keys=sort_keys, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+
+def dumps(obj: Any, sort_keys: bool = False, indent: bool = False) -> str:
+    """
+    Serialize to a str.
+    """
+    return dumpb(obj, sort_keys=sort_keys, indent=indent).decode("utf-8")
+
+
+def loads(data: str | bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
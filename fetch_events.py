@@ -7,7 +7,8 @@ Features:
 - Fetch Ticketmaster events for a set of Bay Area cities and time windows
 - Basic on-disk caching to avoid hammering the API
 - Heuristic scoring via scoring.score_event
-- AI refinement / editorial ranking via ai_filter.refine_top_events_with_ai
+- AI refinement / editorial ranking via ai_filter.refine_all_windows_with_ai
+  (all windows in a single LLM request)
 - Multi-night show collapsing (e.g. 3-night Ariana run → one row with [multi-night x3])
 - Exports:
     * JSON files per window
@@ -21,21 +22,36 @@ You can run this directly:
 
 from __future__ import annotations
 
+import asyncio
+import atexit
 import csv
+import functools
 import hashlib
-import json
+import heapq
+import logging
 import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from logging.handlers import QueueHandler, QueueListener
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import Any, Dict, List, Tuple
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
-from scoring import score_event
-from ai_filter import refine_top_events_with_ai
+import fastjson
+from scoring import _ISO_NEEDS_OFFSET, score_event
+from ai_filter import refine_all_windows_with_ai
 
+logger = logging.getLogger(__name__)
 
 # ---------------------------
 # Config
@@ -61,22 +77,61 @@ WINDOW_DEFS = {
     "far_out": (120, 365),
 }
 
-CACHE_DIR = Path(".tm_cache")
+# Max Ticketmaster requests in flight across all city/window fetches.
+FETCH_CONCURRENCY = 8
+TM_PAGE_SIZE = 100
+# Discovery API allows 5 requests/second per key; stay under it across threads.
+TM_REQUESTS_PER_SECOND = 4
+# Attempts per request when Ticketmaster answers 429 Too Many Requests.
+TM_MAX_ATTEMPTS = 4
+TM_RETRY_BASE_SECONDS = 1.0
+
+CACHE_DB = Path(".tm_cache.sqlite")
 CACHE_TTL_SECONDS = 12 * 3600  # 12 hours
+CACHE_MMAP_BYTES = 256 * 1024 * 1024
 
 EXPORT_DIR = Path("output")
 EXPORT_DIR.mkdir(exist_ok=True, parents=True)
 
 STATE_DIR = Path("state")
 STATE_DIR.mkdir(exist_ok=True, parents=True)
-KNOWN_EVENTS_FILE = STATE_DIR / "known_events.json"
+KNOWN_EVENTS_FILE = STATE_DIR / "known_events.json"  # compacted snapshot
+KNOWN_EVENTS_LOG = STATE_DIR / "known_events.ndjson"  # append-only deltas since the snapshot
+KNOWN_EVENTS_COMPACT_LINES = 1000
+
+# Sort sentinel for events without a start time
+_FAR_FUTURE = datetime.max.replace(tzinfo=timezone.utc)
+
+# Shared read-only stand-in for missing nested objects; never mutate it
+_EMPTY: Dict[str, Any] = {}
+
+
+# One keep-alive session for every Ticketmaster request, so pages, cities and
+# windows reuse pooled connections instead of paying a TLS handshake each time.
+# Every request goes to one host, so a single host pool is enough; its size
+# follows FETCH_CONCURRENCY so no in-flight request has to open a throwaway socket.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=1, pool_maxsize=FETCH_CONCURRENCY),
+)
+
+# Live requests are spaced at least 1/TM_REQUESTS_PER_SECOND apart; cache hits
+# don't count. Callers run in worker threads, so the schedule is lock-protected.
+_RATE_LOCK = threading.Lock()
+_NEXT_REQUEST_AT = 0.0
+
+# Single SQLite file for the Ticketmaster response cache, opened once on first use.
+# Fetch workers run in threads, so the connection is shared behind a lock.
+_CACHE_CONN: sqlite3.Connection | None = None
+_CACHE_LOCK = threading.Lock()
 
 
 # ---------------------------
 # Helpers
 # ---------------------------
 
-@dataclass
+@dataclass(slots=True)
 class NormalizedEvent:
     id: str
     name: str
@@ -92,10 +147,14 @@ class NormalizedEvent:
     window: str
     score: float
     raw: Dict[str, Any]
+    # (artist, venue) normalized once here so multi-night collapsing is a tuple lookup
+    group_key: Tuple[str, str] = ("", "")
 
 
+@functools.lru_cache(maxsize=128)
 def _tm_iso(dt: datetime) -> str:
     # Ticketmaster expects UTC ISO8601 with 'Z'
+    # Cached: every city in a window formats the same start/end datetimes.
     return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
@@ -104,9 +163,11 @@ def _make_cache_key(params: Dict[str, Any]) -> str:
     Produce a deterministic hash for a Ticketmaster params dict,
     ignoring the API key.
     """
-    safe = {k: v for k, v in params.items() if k != "apikey"}
-    blob = json.dumps(safe, sort_keys=True, separators=(",", ":")).encode("utf-8")
-    return hashlib.md5(blob).hexdigest()
+    h = hashlib.blake2b(digest_size=16)
+    for k, v in sorted(params.items()):
+        if k != "apikey":
+            h.update(f"{k}={v}\0".encode("utf-8"))
+    return h.hexdigest()
 
 
 def _params_to_query(params: Dict[str, Any]) -> str:
@@ -116,32 +177,138 @@ def _params_to_query(params: Dict[str, Any]) -> str:
     return "&".join(parts)
 
 
+def _cache_conn() -> sqlite3.Connection:
+    """
+    Open (once) the SQLite response cache. Caller must hold _CACHE_LOCK.
+    """
+    global _CACHE_CONN
+    if _CACHE_CONN is None:
+        conn = sqlite3.connect(CACHE_DB, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # Serve page reads from a memory map instead of read() into SQLite's page cache
+        conn.execute(f"PRAGMA mmap_size={CACHE_MMAP_BYTES}")
+        # Metadata columns come before the body so freshness checks never walk
+        # the BLOB's overflow pages. The cache is disposable: a table with any
+        # other layout (from an older version) is simply rebuilt.
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(tm_cache)")]
+        if columns and columns != ["key", "ts", "etag", "last_modified", "body"]:
+            conn.execute("DROP TABLE tm_cache")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS tm_cache ("
+            "key TEXT PRIMARY KEY, ts INTEGER NOT NULL, etag TEXT, "
+            "last_modified TEXT, body BLOB NOT NULL)"
+        )
+        conn.commit()
+        _CACHE_CONN = conn
+    return _CACHE_CONN
+
+
+def _wait_for_rate_slot() -> None:
+    """
+    Block the calling thread until it may send the next live Ticketmaster request.
+    """
+    global _NEXT_REQUEST_AT
+    with _RATE_LOCK:
+        now = time.monotonic()
+        slot = max(now, _NEXT_REQUEST_AT)
+        _NEXT_REQUEST_AT = slot + 1.0 / TM_REQUESTS_PER_SECOND
+    if slot > now:
+        time.sleep(slot - now)
+
+
+def _tm_send(url: str, params: Dict[str, Any], headers: Dict[str, str]) -> requests.Response:
+    """
+    Rate-limited GET that retries 429 responses, honoring Retry-After when given.
+    The last 429 is returned to the caller like any other response.
+    """
+    for attempt in range(TM_MAX_ATTEMPTS):
+        _wait_for_rate_slot()
+        resp = _SESSION.get(url, params=params, headers=headers or None, timeout=20)
+        if resp.status_code != 429 or attempt == TM_MAX_ATTEMPTS - 1:
+            return resp
+        try:
+            delay = float(resp.headers.get("Retry-After", ""))
+        except ValueError:
+            delay = TM_RETRY_BASE_SECONDS * 2 ** attempt
+        logger.warning("⚠ Ticketmaster rate limit hit for %s, retrying in %.1fs", params.get("city"), delay)
+        time.sleep(delay)
+    return resp
+
+
 def _tm_get_with_cache(params: Dict[str, Any], use_cache: bool = True) -> Dict[str, Any]:
     """
-    Fetch Ticketmaster discovery endpoint with basic file cache.
+    Fetch Ticketmaster discovery endpoint with a SQLite-backed TTL cache.
+
+    Stale entries that carry an ETag or Last-Modified are revalidated with
+    If-None-Match / If-Modified-Since; a 304 refreshes the entry's timestamp
+    and reuses the cached body.
+
+    Freshness is decided from the small metadata columns alone; the body BLOB
+    is only read when it will actually be returned.
     """
     base_url = "https://app.ticketmaster.com/discovery/v2/events.json"
-    CACHE_DIR.mkdir(exist_ok=True, parents=True)
-
     cache_key = _make_cache_key(params)
-    cache_path = CACHE_DIR / f"{cache_key}.json"
 
-    if use_cache and cache_path.exists():
-        age = datetime.now(timezone.utc) - datetime.fromtimestamp(
-            cache_path.stat().st_mtime, tz=timezone.utc
-        )
-        if age.total_seconds() <= CACHE_TTL_SECONDS:
-            print(f"→ [cache hit] params={cache_key}")
-            with open(cache_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+    meta = None
+    if use_cache:
+        with _CACHE_LOCK:
+            conn = _cache_conn()
+            meta = conn.execute(
+                "SELECT ts, etag, last_modified FROM tm_cache WHERE key = ?",
+                (cache_key,),
+            ).fetchone()
+            if meta is not None and time.time() - meta[0] <= CACHE_TTL_SECONDS:
+                body = conn.execute(
+                    "SELECT body FROM tm_cache WHERE key = ?", (cache_key,)
+                ).fetchone()[0]
+            else:
+                body = None
+        if body is not None:
+            logger.info("→ [cache hit] params=%s", cache_key)
+            return fastjson.loads(body)
+
+    headers: Dict[str, str] = {}
+    if meta is not None:
+        if meta[1]:
+            headers["If-None-Match"] = meta[1]
+        if meta[2]:
+            headers["If-Modified-Since"] = meta[2]
+
+    logger.info("→ [live request] %s?%s", base_url, _params_to_query(params))
+    resp = _tm_send(base_url, params, headers)
+    if resp.status_code == 304 and meta is not None:
+        logger.info("→ [cache revalidated] params=%s", cache_key)
+        with _CACHE_LOCK:
+            conn = _cache_conn()
+            conn.execute(
+                "UPDATE tm_cache SET ts = ? WHERE key = ?", (int(time.time()), cache_key)
+            )
+            conn.commit()
+            body = conn.execute(
+                "SELECT body FROM tm_cache WHERE key = ?", (cache_key,)
+            ).fetchone()[0]
+        return fastjson.loads(body)
 
-    print(f"→ [live request] {base_url}?{_params_to_query(params)}")
-    resp = requests.get(base_url, params=params, timeout=20)
     resp.raise_for_status()
-    data = resp.json()
-
-    with open(cache_path, "w", encoding="utf-8") as f:
-        json.dump(data, f)
+    # Keep the raw bytes so the cache stores exactly what Ticketmaster sent.
+    body = resp.content
+    data = fastjson.loads(body)
+
+    with _CACHE_LOCK:
+        conn = _cache_conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO tm_cache (key, ts, body, etag, last_modified) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                cache_key,
+                int(time.time()),
+                body,
+                resp.headers.get("ETag"),
+                resp.headers.get("Last-Modified"),
+            ),
+        )
+        conn.commit()
 
     return data
 
@@ -165,9 +332,18 @@ def _extract_promoter_name(ev: Dict[str, Any]) -> str | None:
     return None
 
 
+@functools.lru_cache(maxsize=4096)
+def _parse_tm_datetime(value: str) -> datetime:
+    # Python 3.11+ fromisoformat accepts a trailing "Z"; older versions need "+00:00".
+    # Cached because runs and multi-city listings repeat the same timestamps.
+    if _ISO_NEEDS_OFFSET and value[-1] == "Z":
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
 def _normalize_tm_event(ev: Dict[str, Any], window: str) -> NormalizedEvent:
-    dates = ev.get("dates", {}) or {}
-    start = dates.get("start", {}) or {}
+    dates = ev.get("dates") or _EMPTY
+    start = dates.get("start") or _EMPTY
 
     # Start date / time
     local_date = start.get("localDate")
@@ -175,32 +351,33 @@ def _normalize_tm_event(ev: Dict[str, Any], window: str) -> NormalizedEvent:
     dt = None
     if date_time:
         try:
-            dt = datetime.fromisoformat(date_time.replace("Z", "+00:00"))
+            dt = _parse_tm_datetime(date_time)
         except Exception:
             dt = None
 
-    embedded = ev.get("_embedded") or {}
-    venues = embedded.get("venues") or []
-    venue = venues[0] if venues else {}
+    embedded = ev.get("_embedded") or _EMPTY
+    venues = embedded.get("venues") or ()
+    venue = venues[0] if venues else _EMPTY
 
-    city = (venue.get("city") or {}).get("name")
-    state = (venue.get("state") or {}).get("stateCode")
-    country = (venue.get("country") or {}).get("countryCode")
+    city = (venue.get("city") or _EMPTY).get("name")
+    state = (venue.get("state") or _EMPTY).get("stateCode")
+    country = (venue.get("country") or _EMPTY).get("countryCode")
     venue_name = venue.get("name")
 
     # Artists / attractions
-    attractions = embedded.get("attractions") or []
+    attractions = embedded.get("attractions") or ()
     primary_artist = None
     if attractions:
         primary_artist = attractions[0].get("name")
 
     promoter_name = _extract_promoter_name(ev)
+    primary_artist = primary_artist or str(ev.get("name"))
 
     # We don't yet have a score; placeholder 0.0, actual score added later.
     return NormalizedEvent(
         id=str(ev.get("id")),
         name=str(ev.get("name")),
-        primary_artist=primary_artist or str(ev.get("name")),
+        primary_artist=primary_artist,
         url=ev.get("url"),
         city=city,
         state=state,
@@ -212,80 +389,129 @@ def _normalize_tm_event(ev: Dict[str, Any], window: str) -> NormalizedEvent:
         window=window,
         score=0.0,
         raw=ev,
+        group_key=(primary_artist.strip().lower(), (venue_name or "").strip().lower()),
     )
 
 
-def _fetch_city_for_window(
+async def _fetch_city_for_window(
     city: str,
     state: str,
     window_name: str,
     start_dt: datetime,
     end_dt: datetime,
+    sem: asyncio.Semaphore,
     max_events: int = 200,
     use_cache: bool = True,
 ) -> List[Dict[str, Any]]:
     """
     Fetch up to max_events Ticketmaster events for a single city + window.
     Returns raw Ticketmaster event objects.
+
+    Each page request runs in a worker thread while holding `sem`, so many
+    city/window fetches can be awaited concurrently. Pages after the first
+    are requested together once page 0 reports totalPages.
     """
+    logger.info("===== Fetching events for %s (%s) =====", city, window_name)
+    logger.info("  Date range: %s → %s", _tm_iso(start_dt), _tm_iso(end_dt))
+    base_params: Dict[str, Any] = {
+        "city": city,
+        "stateCode": state,
+        "countryCode": COUNTRY_CODE,
+        "classificationName": "music",
+        "startDateTime": _tm_iso(start_dt),
+        "endDateTime": _tm_iso(end_dt),
+        "size": TM_PAGE_SIZE,
+        "page": 0,
+        "sort": "date,asc",
+        "apikey": os.getenv("TM_API_KEY") or "",
+    }
+
+    async def fetch_page(page: int) -> Dict[str, Any]:
+        async with sem:
+            return await asyncio.to_thread(
+                _tm_get_with_cache, {**base_params, "page": page}, use_cache
+            )
+
+    # Page 0 tells us totalPages; every later page is independent, so request
+    # the ones we could still need (capped by totalPages and max_events) all at
+    # once and consume them in page order.
+    first = await fetch_page(0)
+    last_page = -(-max_events // TM_PAGE_SIZE) - 1
+    total_pages = (first.get("page") or _EMPTY).get("totalPages")
+    if total_pages is not None:
+        # Keep page 0 even when totalPages is 0 so the "no events" warning fires
+        last_page = min(last_page, max(total_pages - 1, 0))
+    pending = [asyncio.ensure_future(fetch_page(p)) for p in range(1, last_page + 1)]
+
     all_events: List[Dict[str, Any]] = []
-    page = 0
-    total_pages = None
-
-    while True:
-        params: Dict[str, Any] = {
-            "city": city,
-            "stateCode": state,
-            "countryCode": COUNTRY_CODE,
-            "classificationName": "music",
-            "startDateTime": _tm_iso(start_dt),
-            "endDateTime": _tm_iso(end_dt),
-            "size": 100,
-            "page": page,
-            "sort": "date,asc",
-            "apikey": os.getenv("TM_API_KEY") or "",
-        }
-
-        data = _tm_get_with_cache(params, use_cache=use_cache)
-
-        page_events = data.get("_embedded", {}).get("events") or []
-        if not page_events:
-            print(f"⚠ No events found for {city} on page {page}")
-            break
-
-        all_events.extend(page_events)
-        print(f"  ✓ Page {page}: {len(page_events)} events (total so far: {len(all_events)})")
-
-        # Pagination metadata
-        page_info = data.get("page") or {}
-        total_pages = page_info.get("totalPages")
-
-        if len(all_events) >= max_events:
-            print(f"  → Reached max_events={max_events} for {city}, stopping pagination.")
-            break
-
-        if total_pages is not None and page >= total_pages - 1:
-            print(f"  → Reached last page ({page}/{total_pages - 1}) for {city}.")
-            break
-
-        page += 1
-
-    print(f"✓ Found {len(all_events)} events in {city} in total\n")
+    try:
+        for page in range(last_page + 1):
+            data = first if page == 0 else await pending[page - 1]
+            page_events = (data.get("_embedded") or _EMPTY).get("events") or []
+            if not page_events:
+                logger.warning("⚠ No events found for %s on page %s", city, page)
+                break
+
+            all_events.extend(page_events)
+            logger.info(
+                "  ✓ %s (%s) page %s: %s events (total so far: %s)",
+                city, window_name, page, len(page_events), len(all_events),
+            )
+
+            if len(all_events) >= max_events:
+                logger.info("  → Reached max_events=%s for %s, stopping pagination.", max_events, city)
+                break
+
+            if total_pages is not None and page >= total_pages - 1:
+                logger.info("  → Reached last page (%s/%s) for %s.", page, total_pages - 1, city)
+                break
+    finally:
+        # Stopping early: drop speculative pages that haven't been sent yet
+        # (still waiting on `sem`) and reap the rest.
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    logger.info("✓ Found %s events in %s (%s) in total", len(all_events), city, window_name)
     return all_events
 
 
-def _dedupe_events(events: Iterable[NormalizedEvent]) -> List[NormalizedEvent]:
+async def _fetch_all(
+    jobs: List[Tuple[str, str, str, datetime, datetime]],
+    max_events: int = 200,
+    use_cache: bool = True,
+) -> List[List[Dict[str, Any]]]:
     """
-    De-duplicate by Ticketmaster event id, keeping the highest score.
+    Run every (city, state, window_name, start_dt, end_dt) fetch concurrently,
+    with at most FETCH_CONCURRENCY Ticketmaster requests in flight.
+    Results come back in job order; a city/window whose fetch fails is logged
+    and contributes no events instead of aborting the run.
     """
-    best_by_id: Dict[str, NormalizedEvent] = {}
-    for ev in events:
-        if not ev.id:
-            continue
-        existing = best_by_id.get(ev.id)
-        if existing is None or ev.score > existing.score:
-            best_by_id[ev.id] = ev
-    return list(best_by_id.values())
+    sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+    results = await asyncio.gather(
+        *(
+            _fetch_city_for_window(
+                city=city,
+                state=state,
+                window_name=window_name,
+                start_dt=start_dt,
+                end_dt=end_dt,
+                sem=sem,
+                max_events=max_events,
+                use_cache=use_cache,
+            )
+            for city, state, window_name, start_dt, end_dt in jobs
+        ),
+        return_exceptions=True,
+    )
+    fetched: List[List[Dict[str, Any]]] = []
+    for (city, _, window_name, _, _), result in zip(jobs, results):
+        if isinstance(result, Exception):
+            logger.warning("⚠ Fetch failed for %s (%s), skipping: %s", city, window_name, result)
+            fetched.append([])
+        else:
+            fetched.append(result)
+    return fetched
 
 
 def _collapse_multi_night(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -308,11 +534,13 @@ def _collapse_multi_night(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     groups: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = defaultdict(list)
 
     for ev in events:
-        artist = (ev.get("primary_artist") or ev.get("name") or "").strip().lower()
-        venue = (ev.get("venue_name") or "").strip().lower()
-        window = ev.get("window") or ""
-        key = (artist, venue, window)
-        groups[key].append(ev)
+        group_key = ev.get("_group_key")
+        if group_key is None:
+            group_key = (
+                (ev.get("primary_artist") or ev.get("name") or "").strip().lower(),
+                (ev.get("venue_name") or "").strip().lower(),
+            )
+        groups[(*group_key, ev.get("window") or "")].append(ev)
 
     collapsed: List[Dict[str, Any]] = []
 
@@ -327,35 +555,42 @@ def _collapse_multi_night(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
             collapsed.append(ev)
             continue
 
-        # Multi-night run
-        sorted_items = sorted(
-            items,
-            key=lambda e: e.get("start_datetime") or datetime.max.replace(tzinfo=timezone.utc),
-        )
-        first = dict(sorted_items[0])
-
-        dates = [
-            e.get("start_datetime")
-            for e in sorted_items
-            if isinstance(e.get("start_datetime"), datetime)
-        ]
-        if dates:
-            date_start = min(dates)
-            date_end = max(dates)
-        else:
-            date_start = first.get("start_datetime")
-            date_end = first.get("start_datetime")
+        # Multi-night run: one pass for earliest item, date range, ids, max priority
+        first_item: Dict[str, Any] = items[0]
+        first_start = first_item.get("start_datetime") or _FAR_FUTURE
+        date_start = date_end = None
+        dated_ids: List[Tuple[datetime, Any]] = []
+        max_prio = None
+        for e in items:
+            dt = e.get("start_datetime")
+            if (dt or _FAR_FUTURE) < first_start:
+                first_item, first_start = e, dt
+            if isinstance(dt, datetime):
+                if date_start is None or dt < date_start:
+                    date_start = dt
+                if date_end is None or dt > date_end:
+                    date_end = dt
+            if e.get("id"):
+                dated_ids.append((dt or _FAR_FUTURE, e.get("id")))
+            prio = e.get("ai_priority")
+            if prio is not None and (max_prio is None or prio > max_prio):
+                max_prio = prio
+
+        first = dict(first_item)
+        if date_start is None:
+            date_start = date_end = first.get("start_datetime")
 
         first["multi_night"] = True
-        first["night_count"] = len(sorted_items)
-        first["ids"] = [e.get("id") for e in sorted_items if e.get("id")]
+        first["night_count"] = len(items)
+        # ids stay chronological; sorting bare (start, id) pairs is cheaper than the items
+        dated_ids.sort(key=itemgetter(0))
+        first["ids"] = [eid for _, eid in dated_ids]
         first["date_start"] = date_start
         first["date_end"] = date_end
 
         # Aggregate AI priority as max, keep reason from first
-        priorities = [e.get("ai_priority") for e in sorted_items if e.get("ai_priority") is not None]
-        if priorities:
-            first["ai_priority"] = max(priorities)
+        if max_prio is not None:
+            first["ai_priority"] = max_prio
 
         collapsed.append(first)
 
@@ -420,36 +655,39 @@ def _serialize_for_export(ev: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def _export_json(window: str, events: List[Dict[str, Any]]) -> None:
+def _export_json(window: str, rows: List[Dict[str, Any]]) -> None:
+    """
+    `rows` are already passed through _serialize_for_export.
+    """
     path = EXPORT_DIR / f"radar_{window}.json"
-    payload = [_serialize_for_export(ev) for ev in events]
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2, ensure_ascii=False)
-    print(f"✓ JSON exported → {path}")
+    path.write_bytes(fastjson.dumpb(rows, indent=True))
+    logger.info("✓ JSON exported → %s", path)
 
 
-def _export_csv(window: str, events: List[Dict[str, Any]]) -> None:
+def _export_csv(window: str, rows: List[Dict[str, Any]]) -> None:
+    """
+    `rows` are already passed through _serialize_for_export.
+    """
     path = EXPORT_DIR / f"radar_{window}.csv"
-    if not events:
+    if not rows:
         with open(path, "w", newline="", encoding="utf-8") as f:
             f.write("")  # empty
-        print(f"✓ CSV exported (empty) → {path}")
+        logger.info("✓ CSV exported (empty) → %s", path)
         return
 
-    fieldnames = list(_serialize_for_export(events[0]).keys())
+    fieldnames = list(rows[0].keys())
     with open(path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for ev in events:
-            writer.writerow(_serialize_for_export(ev))
-    print(f"✓ CSV exported → {path}")
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows([row[k] for k in fieldnames] for row in rows)
+    logger.info("✓ CSV exported → %s", path)
 
 
 def _export_rss(window: str, events: List[Dict[str, Any]]) -> None:
     """
     Minimal RSS 2.0 feed so you can plug this into a widget or RSS reader.
     """
-    from xml.etree.ElementTree import Element, SubElement, ElementTree
+    from xml.etree.ElementTree import Element, SubElement, tostring
     from email.utils import format_datetime
 
     path = EXPORT_DIR / f"radar_{window}.rss"
@@ -495,9 +733,8 @@ def _export_rss(window: str, events: List[Dict[str, Any]]) -> None:
         reason = ev.get("ai_reason") or ""
         desc_el.text = f"{date_str} — {artist} at {venue}. {reason}".strip()
 
-    tree = ElementTree(rss)
-    tree.write(path, encoding="utf-8", xml_declaration=True)
-    print(f"✓ RSS exported → {path}")
+    path.write_bytes(tostring(rss, encoding="utf-8", xml_declaration=True))
+    logger.info("✓ RSS exported → %s", path)
 
 
 def _export_digest(window: str, events: List[Dict[str, Any]]) -> None:
@@ -528,7 +765,7 @@ def _export_digest(window: str, events: List[Dict[str, Any]]) -> None:
     with open(path, "w", encoding="utf-8") as f:
         f.write("\n".join(lines))
 
-    print(f"✓ Digest exported → {path}")
+    logger.info("✓ Digest exported → %s", path)
 
 
 # ---------------------------
@@ -537,41 +774,103 @@ def _export_digest(window: str, events: List[Dict[str, Any]]) -> None:
 
 def _load_known_events() -> Dict[str, Dict[str, str]]:
     """
-    Load the known events state file.
+    Load the known events state: the compacted snapshot plus any deltas
+    appended to the log since, compacting the log into the snapshot once it
+    grows past KNOWN_EVENTS_COMPACT_LINES.
     Returns a dict like:
     {
       "short_term": {"event_key": "2025-11-20", ...},
       "far_out": {"event_key": "2025-11-20", ...}
     }
     """
-    if not KNOWN_EVENTS_FILE.exists():
-        return {}
-    
+    known: Dict[str, Dict[str, str]] = {}
+
+    if KNOWN_EVENTS_FILE.exists():
+        try:
+            data = fastjson.loads(KNOWN_EVENTS_FILE.read_bytes())
+            if isinstance(data, dict):
+                known = data
+        except Exception as e:
+            logger.warning("⚠ Failed to load known events: %s", e)
+
+    for window in WINDOW_DEFS.keys():
+        if window not in known:
+            known[window] = {}
+
+    if not KNOWN_EVENTS_LOG.exists():
+        return known
+
+    # Replay the delta log: {"op": "+", "window", "key", "date"} / {"op": "-", "window", "key"}
+    # A torn or undecodable line (e.g. a crash mid-append) is skipped, not fatal.
+    line_count = 0
+    skipped = 0
     try:
-        with open(KNOWN_EVENTS_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        # Ensure both windows exist
-        if not isinstance(data, dict):
-            return {}
-        for window in WINDOW_DEFS.keys():
-            if window not in data:
-                data[window] = {}
-        return data
-    except Exception as e:
-        print(f"⚠ Failed to load known events: {e}")
-        return {}
+        with open(KNOWN_EVENTS_LOG, "rb") as f:
+            for lineno, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                line_count += 1
+                try:
+                    rec = fastjson.loads(line)
+                    bucket = known.setdefault(rec["window"], {})
+                    if rec["op"] == "+":
+                        bucket[rec["key"]] = rec["date"]
+                    else:
+                        bucket.pop(rec["key"], None)
+                except Exception as e:
+                    skipped += 1
+                    logger.warning("⚠ Skipping bad known events log line %s: %s", lineno, e)
+    except OSError as e:
+        logger.warning("⚠ Failed to replay known events log: %s", e)
+        return known
+
+    # Also compact after skipping lines, so later appends don't land after a torn tail.
+    if line_count > KNOWN_EVENTS_COMPACT_LINES or skipped:
+        # Snapshot first (atomically), then truncate: replaying a log over a
+        # snapshot that already contains it is harmless if we stop in between.
+        try:
+            tmp = KNOWN_EVENTS_FILE.with_name(KNOWN_EVENTS_FILE.name + ".tmp")
+            tmp.write_bytes(fastjson.dumpb(known, indent=True))
+            os.replace(tmp, KNOWN_EVENTS_FILE)
+            KNOWN_EVENTS_LOG.write_bytes(b"")
+            logger.info("✓ Compacted %s known-event deltas → %s", line_count, KNOWN_EVENTS_FILE)
+        except Exception as e:
+            logger.warning("⚠ Failed to compact known events: %s", e)
 
+    return known
 
-def _save_known_events(known: Dict[str, Dict[str, str]]) -> None:
+
+def _append_known_delta(
+    added: List[Tuple[str, str, str]],
+    removed: List[Tuple[str, str]],
+) -> None:
     """
-    Save the known events state file.
+    Append this run's changes to the known events log, one NDJSON line each.
+    `added` holds (window, key, date); `removed` holds (window, key).
     """
+    if not added and not removed:
+        logger.info("✓ Known events unchanged")
+        return
+
+    lines = [
+        fastjson.dumpb({"op": "-", "window": window, "key": key})
+        for window, key in removed
+    ]
+    lines += [
+        fastjson.dumpb({"op": "+", "window": window, "key": key, "date": date})
+        for window, key, date in added
+    ]
     try:
-        with open(KNOWN_EVENTS_FILE, "w", encoding="utf-8") as f:
-            json.dump(known, f, indent=2, ensure_ascii=False)
-        print(f"✓ Known events state saved → {KNOWN_EVENTS_FILE}")
+        with open(KNOWN_EVENTS_LOG, "ab") as f:
+            f.write(b"\n".join(lines) + b"\n")
+        logger.info(
+            "✓ Known events delta appended → %s (+%s / -%s)",
+            KNOWN_EVENTS_LOG,
+            len(added),
+            len(removed),
+        )
     except Exception as e:
-        print(f"⚠ Failed to save known events: {e}")
+        logger.warning("⚠ Failed to save known events: %s", e)
 
 
 def _event_key(ev: Dict[str, Any]) -> str:
@@ -588,15 +887,13 @@ def _event_key(ev: Dict[str, Any]) -> str:
     return str(ev.get("id", ""))
 
 
-def _export_new_only_json(window: str, events: List[Dict[str, Any]]) -> None:
+def _export_new_only_json(window: str, rows: List[Dict[str, Any]]) -> None:
     """
-    Export JSON file containing only new events.
+    Export JSON file containing only new events (rows already serialized).
     """
     path = EXPORT_DIR / f"radar_{window}_new.json"
-    payload = [_serialize_for_export(ev) for ev in events]
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2, ensure_ascii=False)
-    print(f"✓ New events JSON exported → {path}")
+    path.write_bytes(fastjson.dumpb(rows, indent=True))
+    logger.info("✓ New events JSON exported → %s", path)
 
 
 def _export_new_only_digest(window: str, events: List[Dict[str, Any]]) -> None:
@@ -634,54 +931,73 @@ def _export_new_only_digest(window: str, events: List[Dict[str, Any]]) -> None:
     with open(path, "w", encoding="utf-8") as f:
         f.write("\n".join(lines))
 
-    print(f"✓ New events digest exported → {path}")
+    logger.info("✓ New events digest exported → %s", path)
 
 
 # ---------------------------
 # Main orchestration
 # ---------------------------
 
+def _configure_logging() -> None:
+    """
+    Log at INFO through a queue: fetch and export threads only enqueue records,
+    and a single listener thread writes them to stdout.
+    """
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    # The QueueHandler formats each record before enqueueing it, so it gets the format
+    logging.basicConfig(
+        level=logging.INFO, format="%(message)s", handlers=[QueueHandler(records)]
+    )
+    # Keep per-request "HTTP Request: ..." lines from the OpenAI client out of the run log
+    for name in ("httpx", "httpcore", "openai"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    listener = QueueListener(records, logging.StreamHandler(sys.stdout))
+    listener.start()
+    atexit.register(listener.stop)
+
+
 def main() -> None:
     load_dotenv()
+    _configure_logging()
 
-    print("\n==============================")
-    print("InYourBones — Ticketmaster Radar (Scored + AI Refined + Cached)")
-    print("==============================\n")
+    logger.info("")
+    logger.info("==============================")
+    logger.info("InYourBones — Ticketmaster Radar (Scored + AI Refined + Cached)")
+    logger.info("==============================")
+    logger.info("")
 
     # Environment check
     tm_key = os.getenv("TM_API_KEY")
     if not tm_key:
-        print("❌ TM_API_KEY not set in environment.")
+        logger.error("❌ TM_API_KEY not set in environment.")
         return
 
     openai_key = os.getenv("OPENAI_API_KEY")
-    print("Environment check:")
-    print(f"✓ TM_API_KEY loaded: {'Yes' if tm_key else 'No'}")
-    print(f"✓ OPENAI_API_KEY present: {'Yes' if openai_key else 'No'}")
-    print(f"✓ Caching enabled: True (TTL={CACHE_TTL_SECONDS/3600:.0f}h, dir={CACHE_DIR})")
-    print()
+    logger.info("Environment check:")
+    logger.info("✓ TM_API_KEY loaded: %s", "Yes" if tm_key else "No")
+    logger.info("✓ OPENAI_API_KEY present: %s", "Yes" if openai_key else "No")
+    logger.info("✓ Caching enabled: True (TTL=%.0fh, db=%s)", CACHE_TTL_SECONDS / 3600, CACHE_DB)
+    logger.info("")
 
     # Optional: GOOGLE_CREDS_JSON just to sanity-check env
     google_creds_raw = os.getenv("GOOGLE_CREDS_JSON")
     if google_creds_raw:
         try:
-            json.loads(google_creds_raw)
-            print("✓ Loaded GOOGLE_CREDS_JSON successfully\n")
-        except json.JSONDecodeError:
-            print("⚠ GOOGLE_CREDS_JSON is set but not valid JSON\n")
+            fastjson.loads(google_creds_raw)
+            logger.info("✓ Loaded GOOGLE_CREDS_JSON successfully")
+            logger.info("")
+        except ValueError:
+            logger.warning("⚠ GOOGLE_CREDS_JSON is set but not valid JSON")
+            logger.info("")
     else:
-        print("ℹ GOOGLE_CREDS_JSON not set (ok if you don't need Sheets/BigQuery)\n")
+        logger.info("ℹ GOOGLE_CREDS_JSON not set (ok if you don't need Sheets/BigQuery)")
+        logger.info("")
 
     now = datetime.now(timezone.utc)
 
-    all_normalized: List[NormalizedEvent] = []
-
-    # Fetch + normalize for each window & city
+    # Fetch every window & city concurrently
+    jobs: List[Tuple[str, str, str, datetime, datetime]] = []
     for window_name, (start_offset, end_offset) in WINDOW_DEFS.items():
-        print("\n==============================")
-        print(f"Window: {window_name} ({start_offset}–{end_offset} days from now)")
-        print("==============================\n")
-
         start_dt = datetime.combine(
             (now + timedelta(days=start_offset)).date(),
             datetime.min.time(),
@@ -692,123 +1008,97 @@ def main() -> None:
             datetime.min.time(),
             tzinfo=timezone.utc,
         )
-
+        logger.info("Window: %s (%s–%s days from now)", window_name, start_offset, end_offset)
         for city, state in CITIES:
-            print(f"===== Fetching events for {city} =====")
-            print(f"  Date range: {_tm_iso(start_dt)} → {_tm_iso(end_dt)}")
-            raw_events = _fetch_city_for_window(
-                city=city,
-                state=state,
-                window_name=window_name,
-                start_dt=start_dt,
-                end_dt=end_dt,
-                max_events=200,
-                use_cache=True,
-            )
-            for ev in raw_events:
-                norm = _normalize_tm_event(ev, window_name)
-                all_normalized.append(norm)
-
-    # Convert NormalizedEvent dataclasses to dicts and score them
-    enriched: List[Dict[str, Any]] = []
-    for ne in all_normalized:
-        ev_dict = {
-            "id": ne.id,
-            "name": ne.name,
-            "primary_artist": ne.primary_artist,
-            "url": ne.url,
-            "city": ne.city,
-            "state": ne.state,
-            "country": ne.country,
-            "venue_name": ne.venue_name,
-            "local_date": ne.local_date,
-            "start_datetime": ne.start_datetime,
-            "promoter_name": ne.promoter_name,
-            "window": ne.window,
-        }
-        sres = score_event(
-            {
-                **ev_dict,
-                "_embedded": ne.raw.get("_embedded") if isinstance(ne.raw, dict) else None,
-                "classifications": ne.raw.get("classifications") if isinstance(ne.raw, dict) else [],
+            jobs.append((city, state, window_name, start_dt, end_dt))
+
+    logger.info("")
+    logger.info("Fetching %s city/window combinations (concurrency=%s)", len(jobs), FETCH_CONCURRENCY)
+    logger.info("")
+    fetched = asyncio.run(_fetch_all(jobs, max_events=200, use_cache=True))
+
+    # Normalize, score and de-duplicate by TM id in one streaming pass: each raw
+    # event is scored as it is normalized and only the best-scoring dict per id
+    # is kept, so no intermediate normalized/enriched lists are built.
+    total_before = 0
+    best_by_id: Dict[str, Dict[str, Any]] = {}
+    for (_, _, window_name, _, _), raw_events in zip(jobs, fetched):
+        for raw in raw_events:
+            ne = _normalize_tm_event(raw, window_name)
+            total_before += 1
+            ev_dict = {
+                "id": ne.id,
+                "name": ne.name,
+                "primary_artist": ne.primary_artist,
+                "url": ne.url,
+                "city": ne.city,
+                "state": ne.state,
+                "country": ne.country,
+                "venue_name": ne.venue_name,
+                "local_date": ne.local_date,
                 "start_datetime": ne.start_datetime,
+                "promoter_name": ne.promoter_name,
+                "window": ne.window,
+                "_group_key": ne.group_key,
             }
-        )
-        ev_dict["score"] = sres.score
-        enriched.append(ev_dict)
-
-    # De-duplicate by TM id
-    deduped = _dedupe_events(
-        [
-            NormalizedEvent(
-                id=e["id"],
-                name=e["name"],
-                primary_artist=e["primary_artist"],
-                url=e["url"],
-                city=e["city"],
-                state=e["state"],
-                country=e["country"],
-                venue_name=e["venue_name"],
-                local_date=e["local_date"],
-                start_datetime=e["start_datetime"],
-                promoter_name=e["promoter_name"],
-                window=e["window"],
-                score=e["score"],
-                raw={},
+            sres = score_event(
+                {
+                    **ev_dict,
+                    "_embedded": raw.get("_embedded"),
+                    "classifications": raw.get("classifications"),
+                },
+                now=now,
             )
-            for e in enriched
-        ]
-    )
+            ev_dict["score"] = sres.score
 
-    # Convert back to dicts with scores
-    deduped_dicts: List[Dict[str, Any]] = [
-        {
-            "id": ev.id,
-            "name": ev.name,
-            "primary_artist": ev.primary_artist,
-            "url": ev.url,
-            "city": ev.city,
-            "state": ev.state,
-            "country": ev.country,
-            "venue_name": ev.venue_name,
-            "local_date": ev.local_date,
-            "start_datetime": ev.start_datetime,
-            "promoter_name": ev.promoter_name,
-            "window": ev.window,
-            "score": ev.score,
-        }
-        for ev in deduped
-    ]
+            if not ne.id:
+                continue
+            existing = best_by_id.get(ne.id)
+            if existing is None or ev_dict["score"] > existing["score"]:
+                best_by_id[ne.id] = ev_dict
 
-    print(f"✓ After deduplication, events count: {len(deduped_dicts)}\n")
+    deduped_dicts = list(best_by_id.values())
 
-    # Per-window AI refinement & collapsing
-    final_by_window: Dict[str, List[Dict[str, Any]]] = {}
+    logger.info("✓ After deduplication, events count: %s", len(deduped_dicts))
+    logger.info("")
 
-    for window_name in WINDOW_DEFS.keys():
-        window_events = [e for e in deduped_dicts if e["window"] == window_name]
-        window_events.sort(key=lambda e: e["score"], reverse=True)
-
-        pre_top_n = 200
-        candidates = window_events[:pre_top_n]
-        top_k = 20  # final number of rows we care about per window
+    # Per-window candidate selection, then one batched AI refinement call
+    pre_top_n = 200
+    top_k = 20  # final number of rows we care about per window
+    ai_windows: List[Tuple[str, List[Dict[str, Any]], int]] = []
 
-        print("==============================")
-        print(
-            f"AI-refined top events for window '{window_name}' "
-            f"(from {len(window_events)} events, taking first {len(candidates)} for AI)"
-        )
-        print("==============================")
+    # Bucket by window in one pass, then keep only the top pre_top_n of each bucket
+    buckets: Dict[str, List[Dict[str, Any]]] = {w: [] for w in WINDOW_DEFS}
+    for e in deduped_dicts:
+        buckets[e["window"]].append(e)
 
-        refined = refine_top_events_with_ai(
-            candidates,
+    for window_name in WINDOW_DEFS.keys():
+        window_events = buckets[window_name]
+        candidates = heapq.nlargest(pre_top_n, window_events, key=itemgetter("score"))
+        logger.info(
+            "Window '%s': %s events, taking first %s for AI",
             window_name,
-            top_k=top_k,
-            max_items=pre_top_n,
-            debug=False,
+            len(window_events),
+            len(candidates),
         )
+        ai_windows.append((window_name, candidates, top_k))
+    logger.info("")
+
+    refined_by_window = refine_all_windows_with_ai(
+        ai_windows,
+        max_items=pre_top_n,
+        debug=False,
+    )
+
+    # Per-window collapsing
+    final_by_window: Dict[str, List[Dict[str, Any]]] = {}
+
+    for window_name in WINDOW_DEFS.keys():
+        logger.info("==============================")
+        logger.info("AI-refined top events for window '%s'", window_name)
+        logger.info("==============================")
 
-        collapsed = _collapse_multi_night(refined)
+        collapsed = _collapse_multi_night(refined_by_window.get(window_name, []))
         final_by_window[window_name] = collapsed
 
         # Print to console
@@ -821,78 +1111,106 @@ def main() -> None:
             if ev.get("multi_night"):
                 multi = f" [multi-night x{ev.get('night_count')}]"
             ai_str = f" | AI {ai:.1f}" if isinstance(ai, (int, float)) and ai is not None else ""
-            print(
-                f" • [{ev.get('score'):.3f}{ai_str}] {date_str} — "
-                f"{ev.get('name')} @ {venue} ({city}){multi} [{window_name}]"
+            logger.info(
+                " • [%.3f%s] %s — %s @ %s (%s)%s [%s]",
+                ev.get("score"),
+                ai_str,
+                date_str,
+                ev.get("name"),
+                venue,
+                city,
+                multi,
+                window_name,
             )
 
-        print()
+        logger.info("")
 
-    total_before = len(all_normalized)
     total_after = sum(len(v) for v in final_by_window.values())
-    print("==============================")
-    print(f"Total normalized events before dedupe: {total_before}")
-    print(f"Total collapsed editorial picks after AI: {total_after}")
-    print("==============================\n")
+    logger.info("==============================")
+    logger.info("Total normalized events before dedupe: %s", total_before)
+    logger.info("Total collapsed editorial picks after AI: %s", total_after)
+    logger.info("==============================")
+    logger.info("")
 
     # Load known events from previous runs
-    print("Loading known events state...")
+    logger.info("Loading known events state...")
     known_events = _load_known_events()
     for window in WINDOW_DEFS.keys():
         if window not in known_events:
             known_events[window] = {}
-    print(f"✓ Loaded {sum(len(v) for v in known_events.values())} known events from previous runs\n")
+    logger.info("✓ Loaded %s known events from previous runs", sum(len(v) for v in known_events.values()))
+    logger.info("")
+
+    # Serialize each collapsed event once; JSON/CSV exports share these rows
+    rows_by_window: Dict[str, List[Dict[str, Any]]] = {
+        window_name: [_serialize_for_export(ev) for ev in events]
+        for window_name, events in final_by_window.items()
+    }
 
     # Track new events and update state
     new_by_window: Dict[str, List[Dict[str, Any]]] = {}
+    new_rows_by_window: Dict[str, List[Dict[str, Any]]] = {}
     run_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    added: List[Tuple[str, str, str]] = []
+    removed: List[Tuple[str, str]] = []
 
-    print("Identifying new events...")
+    logger.info("Identifying new events...")
     for window_name, events in final_by_window.items():
-        # Build set of current event keys in this window
-        current_keys = {_event_key(ev) for ev in events if _event_key(ev)}
+        # Key each event once; multi-night keys sort their ids
+        keyed = [(ev, _event_key(ev)) for ev in events]
+        current_keys = {key for _, key in keyed if key}
         
         # Remove events that are no longer in the current window (cleanup old entries)
         old_keys = set(known_events[window_name].keys())
         removed_keys = old_keys - current_keys
         if removed_keys:
-            for key in removed_keys:
+            for key in sorted(removed_keys):
                 del known_events[window_name][key]
-            print(f"  {window_name}: Removed {len(removed_keys)} events that are no longer in window")
+                removed.append((window_name, key))
+            logger.info("  %s: Removed %s events that are no longer in window", window_name, len(removed_keys))
         
         # Identify new events
         new_events = []
-        for ev in events:
-            key = _event_key(ev)
+        new_rows = []
+        for (ev, key), row in zip(keyed, rows_by_window[window_name]):
             if key and key not in known_events[window_name]:
                 new_events.append(ev)
+                new_rows.append(row)
                 # Add to known events with current run date
                 known_events[window_name][key] = run_date
+                added.append((window_name, key, run_date))
         
         new_by_window[window_name] = new_events
-        print(f"  {window_name}: {len(new_events)} new out of {len(events)} total")
+        new_rows_by_window[window_name] = new_rows
+        logger.info("  %s: %s new out of %s total", window_name, len(new_events), len(events))
     
-    print()
-
-    # Save updated known events state
-    _save_known_events(known_events)
-    print()
-
-    # Exports - Full feeds
-    print("Exporting full feeds...")
-    for window_name, events in final_by_window.items():
-        _export_json(window_name, events)
-        _export_csv(window_name, events)
-        _export_rss(window_name, events)
-        _export_digest(window_name, events)
-    print()
-
-    # Exports - New-only feeds
-    print("Exporting new-only feeds...")
-    for window_name, new_events in new_by_window.items():
-        _export_new_only_json(window_name, new_events)
-        _export_new_only_digest(window_name, new_events)
-    print()
+    logger.info("")
+
+    # Record only what changed in the known events log
+    _append_known_delta(added, removed)
+    logger.info("")
+
+    # Exports - full and new-only feeds. Every file is independent, so write them
+    # from a thread pool and wait once.
+    logger.info("Exporting full and new-only feeds...")
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        futures = []
+        for window_name, events in final_by_window.items():
+            rows = rows_by_window[window_name]
+            futures += [
+                ex.submit(_export_json, window_name, rows),
+                ex.submit(_export_csv, window_name, rows),
+                ex.submit(_export_rss, window_name, events),
+                ex.submit(_export_digest, window_name, events),
+            ]
+        for window_name, new_events in new_by_window.items():
+            futures += [
+                ex.submit(_export_new_only_json, window_name, new_rows_by_window[window_name]),
+                ex.submit(_export_new_only_digest, window_name, new_events),
+            ]
+        for fut in futures:
+            fut.result()
+    logger.info("")
 
 
 if __name__ == "__main__":
@@ -11,6 +11,10 @@ This module is intentionally self-contained and does NOT call any external APIs.
 
 from __future__ import annotations
 
+import functools
+import re
+import sys
+from bisect import bisect_right
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional
@@ -105,19 +109,39 @@ DEFAULT_VENUE_WEIGHT = 0.75
 def _normalize_key(value: Optional[str]) -> str:
     if not value:
         return ""
-    return value.strip().lower()
+    # Interned so tier-dict hits on exact venue names compare by identity
+    return sys.intern(value.strip().lower())
 
 
-def venue_weight(name: Optional[str]) -> float:
-    key = _normalize_key(name)
-    if not key:
-        return DEFAULT_VENUE_WEIGHT
+def _scan_venue_tiers(key: str) -> float:
+    # First substring match in VENUE_TIERS order wins.
     for known, w in VENUE_TIERS.items():
         if known in key:
             return w
     return DEFAULT_VENUE_WEIGHT
 
 
+# Built once at import so most lookups skip the linear scan:
+#   - a venue name that is itself a tier key resolves with one dict lookup
+#     (precomputed with the same first-match rule)
+#   - a name containing no tier key at all is rejected by one regex search
+_VENUE_EXACT: Dict[str, float] = {k: _scan_venue_tiers(k) for k in VENUE_TIERS}
+_VENUE_ANY = re.compile("|".join(re.escape(k) for k in VENUE_TIERS))
+
+
+@functools.lru_cache(maxsize=4096)
+def venue_weight(name: Optional[str]) -> float:
+    key = _normalize_key(name)
+    if not key:
+        return DEFAULT_VENUE_WEIGHT
+    w = _VENUE_EXACT.get(key)
+    if w is not None:
+        return w
+    if _VENUE_ANY.search(key) is None:
+        return DEFAULT_VENUE_WEIGHT
+    return _scan_venue_tiers(key)
+
+
 # ---------------------------
 # Genre / classification fit
 # ---------------------------
@@ -145,7 +169,7 @@ def genre_fit(event: Dict[str, Any]) -> float:
     """
     Very lightweight genre fit based on Ticketmaster 'classifications'.
     """
-    classes = event.get("classifications") or []
+    classes = event.get("classifications") or ()
     texts = []
     for c in classes:
         for key in ("genre", "subGenre", "segment", "subType", "type"):
@@ -160,9 +184,18 @@ def genre_fit(event: Dict[str, Any]) -> float:
 
     best = 0.7
     for text in texts:
-        for hint, weight in GENRE_HINTS.items():
-            if hint in text:
-                best = max(best, weight)
+        best = max(best, _genre_text_weight(text))
+    return best
+
+
+@functools.lru_cache(maxsize=1024)
+def _genre_text_weight(text: str) -> float:
+    # Events repeat a small set of genre names, so each is matched against
+    # GENRE_HINTS only once.
+    best = 0.7
+    for hint, weight in GENRE_HINTS.items():
+        if hint in text:
+            best = max(best, weight)
     return best
 
 
@@ -170,6 +203,13 @@ def genre_fit(event: Dict[str, Any]) -> float:
 # Date proximity bonus
 # ---------------------------
 
+# Day-count ladder: in the past -> -0.2 (strongly down-weight), <=7 -> 0.10,
+# <=30 -> 0.08, <=120 -> 0.05, <=365 -> 0.02, beyond -> 0.0.
+# bisect_right over the breakpoints picks the bucket with one binary search.
+_DATE_BONUS_BREAKS = (0, 8, 31, 121, 366)
+_DATE_BONUS_VALUES = (-0.2, 0.10, 0.08, 0.05, 0.02, 0.0)
+
+
 def date_proximity_bonus(dt: Optional[datetime], now: Optional[datetime] = None) -> float:
     """
     Gives a small bonus for nearer-term shows.
@@ -180,45 +220,38 @@ def date_proximity_bonus(dt: Optional[datetime], now: Optional[datetime] = None)
     if now is None:
         now = datetime.now(timezone.utc)
 
-    delta_days = (dt - now).days
-    if delta_days < 0:
-        return -0.2  # in the past, strongly down-weight
-    if delta_days <= 7:
-        return 0.10
-    if delta_days <= 30:
-        return 0.08
-    if delta_days <= 120:
-        return 0.05
-    if delta_days <= 365:
-        return 0.02
-    return 0.0
+    return _DATE_BONUS_VALUES[bisect_right(_DATE_BONUS_BREAKS, (dt - now).days)]
+
+
+# Python 3.11+ fromisoformat accepts a trailing "Z" directly
+_ISO_NEEDS_OFFSET = sys.version_info < (3, 11)
 
 
 # ---------------------------
 # Public API
 # ---------------------------
 
-@dataclass
+@dataclass(slots=True)
 class ScoreResult:
     score: float
     components: Dict[str, float]
 
 
-def score_event(event: Dict[str, Any]) -> ScoreResult:
+def score_event(event: Dict[str, Any], now: Optional[datetime] = None) -> ScoreResult:
     """
     Compute a base numeric score in [0, 1] for an event.
 
     We combine:
       - venue weight
       - genre fit
-      - date proximity
+      - date proximity (relative to `now`; pass it in when scoring many events)
     """
     # Venue
-    v_name = event.get("venue_name") or (
-        (event.get("_embedded") or {}).get("venues", [{}])[0].get("name")
-        if isinstance(event.get("_embedded"), dict)
-        else None
-    )
+    v_name = event.get("venue_name")
+    if not v_name:
+        embedded = event.get("_embedded")
+        venues = (embedded.get("venues") or ()) if isinstance(embedded, dict) else ()
+        v_name = venues[0].get("name") if venues else None
     v_weight = venue_weight(v_name)
 
     # Genre
@@ -228,10 +261,12 @@ def score_event(event: Dict[str, Any]) -> ScoreResult:
     dt = event.get("start_datetime") or event.get("date")
     if isinstance(dt, str):
         try:
-            dt = datetime.fromisoformat(dt.replace("Z", "+00:00"))
+            if _ISO_NEEDS_OFFSET and dt.endswith("Z"):
+                dt = dt[:-1] + "+00:00"
+            dt = datetime.fromisoformat(dt)
         except Exception:
             dt = None
-    d_bonus = date_proximity_bonus(dt)
+    d_bonus = date_proximity_bonus(dt, now)
 
     # Combine
     base = 0.5
@@ -1,67 +1,384 @@
 # sheets_client.py
 import os
-import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from functools import lru_cache
+from itertools import zip_longest
+from operator import itemgetter
+from pathlib import Path
 from datetime import datetime, timezone
 
 import gspread
+from google.auth.transport.requests import AuthorizedSession, Request
 from google.oauth2.service_account import Credentials
+from gspread.urls import DRIVE_FILES_API_V3_URL, SPREADSHEETS_API_V4_BASE_URL
+from gspread.utils import a1_range_to_grid_range, absolute_range_name, rowcol_to_a1
+from requests.adapters import HTTPAdapter
+
+import fastjson
 
 SPREADSHEET_ID = os.environ["SHEET_ID"]
-SERVICE_ACCOUNT_INFO = json.loads(os.environ["GOOGLE_CREDS_JSON"])
+# Parsed once at import
+SERVICE_ACCOUNT_INFO = fastjson.loads(os.environ["GOOGLE_CREDS_JSON"])
+
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    # Read the spreadsheet's Drive version to validate the cached row index
+    "https://www.googleapis.com/auth/drive.metadata.readonly",
+]
+SHEETS_POOL_SIZE = 16
+SHEETS_WRITE_CONCURRENCY = 8
+INDEX_CACHE_FILE = Path(".sheets_index.json")
+# Drive only promises that `version` grows on every change, not that one API
+# write bumps it exactly once, so allow a few bumps per write
+DRIVE_VERSION_BUMPS_PER_WRITE = 3
+BATCH_UPDATE_CHUNK = 500  # ranges per values.batchUpdateByDataFilter request
+
+# Retry policy for rate limits (429) and server errors (5xx) on batch calls
+SHEETS_MAX_ATTEMPTS = 6
+SHEETS_RETRY_BASE_SECONDS = 1.0
+SHEETS_RETRY_MAX_SECONDS = 60.0
+
+logger = logging.getLogger(__name__)
+
+_WRITE_POOL = ThreadPoolExecutor(max_workers=SHEETS_WRITE_CONCURRENCY)
+
+HEADER = [
+    "source_event_id", "source", "event_name", "artist_primary", "artist_all",
+    "venue", "city", "date", "weekday", "is_weekend", "genre_primary",
+    "onsale_start", "tm_popularity_raw", "venue_tier", "genre_fit",
+    "score_total", "window", "press_contact_name", "press_contact_url",
+    "press_contact_email", "recommended", "last_seen",
+]
+
+# Event fields copied straight into a row; "recommended" and "last_seen" are derived
+_ROW_FIELDS = itemgetter(*HEADER[:-2])
+_DATE_POS = HEADER.index("date")
+_SCORE_POS = HEADER.index("score_total")
+_WINDOW_POS = HEADER.index("window")
+
+def _col_letter(name):
+    return rowcol_to_a1(1, HEADER.index(name) + 1).rstrip("0123456789")
+
+# Last column letter of a data row ("V" for the 22 columns above)
+LAST_COL = _col_letter(HEADER[-1])
+
+# Joins source_event_id and window into one index key; the ASCII unit
+# separator can't occur in either value
+KEY_SEP = "\x1f"
+
+# Rows with more changed cells than this are rewritten whole
+WHOLE_ROW_THRESHOLD = len(HEADER) // 2
+
+# Only the two key columns are read back to build the upsert index
+KEY_RANGES = [f"{_col_letter(c)}2:{_col_letter(c)}" for c in ("source_event_id", "window")]
+
+def _grid_range(sheet_id, lo, hi, c1, c2, block):
+    # Zero-based, end-exclusive bounds covering sheet rows lo..hi and columns [c1, c2)
+    return {
+        "dataFilter": {"gridRange": {
+            "sheetId": sheet_id,
+            "startRowIndex": lo - 1, "endRowIndex": hi,
+            "startColumnIndex": c1, "endColumnIndex": c2,
+        }},
+        "majorDimension": "ROWS",
+        "values": block,
+    }
+
+def _changed_spans(old, row):
+    """[start, end) column spans where `row` differs from the last written `old`."""
+    if old is None or len(old) != len(row):
+        return [(0, len(row))]
+    changed = [c for c, (a, b) in enumerate(zip(old, row)) if a != b]
+    if len(changed) > WHOLE_ROW_THRESHOLD:
+        return [(0, len(row))]
+    spans = []
+    for c in changed:
+        if spans and spans[-1][1] == c:
+            spans[-1] = (spans[-1][0], c + 1)
+        else:
+            spans.append((c, c + 1))
+    return spans
+
+def _coalesce_updates(cell_updates, sheet_id):
+    """Merge (row_index, c1, c2, cells) writes covering the same columns on consecutive rows."""
+    ranges = []
+    lo = prev = span = None
+    block = []
+    for idx, c1, c2, cells in sorted(cell_updates, key=lambda u: (u[1], u[2], u[0])):
+        if block and (idx != prev + 1 or (c1, c2) != span):
+            ranges.append(_grid_range(sheet_id, lo, prev, *span, block))
+            block = []
+        if not block:
+            lo, span = idx, (c1, c2)
+        block.append(cells)
+        prev = idx
+    if block:
+        ranges.append(_grid_range(sheet_id, lo, prev, *span, block))
+    return ranges
+
+def _request(sheet, method, url, **kwargs):
+    # gspread 6 moved request() to http_client
+    client = sheet.spreadsheet.client
+    return getattr(client, "http_client", client).request(method, url, **kwargs)
+
+def _batch_update_by_data_filter(sheet, data):
+    # gspread has no wrapper for this endpoint
+    url = f"{SPREADSHEETS_API_V4_BASE_URL}/{sheet.spreadsheet.id}/values:batchUpdateByDataFilter"
+    return _request(sheet, "post", url, json={"valueInputOption": "RAW", "data": data})
+
+def _backoff_or_raise(e, attempt):
+    """Sleep before the next attempt on 429/5xx; re-raise anything else or the last failure."""
+    status = e.response.status_code
+    if (status != 429 and status < 500) or attempt == SHEETS_MAX_ATTEMPTS - 1:
+        raise e
+    delay = min(SHEETS_RETRY_BASE_SECONDS * 2 ** attempt, SHEETS_RETRY_MAX_SECONDS) + random.random()
+    logger.warning("⚠ Sheets API error %d, retrying in %.1fs", status, delay)
+    time.sleep(delay)
+
+def _call_with_retry(fn, *args, **kwargs):
+    """Call an idempotent Sheets read or overwrite, backing off on 429/5xx."""
+    for attempt in range(SHEETS_MAX_ATTEMPTS):
+        try:
+            return fn(*args, **kwargs)
+        except gspread.exceptions.APIError as e:
+            _backoff_or_raise(e, attempt)
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
 
-SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+_CREDS = Credentials.from_service_account_info(SERVICE_ACCOUNT_INFO, scopes=SCOPES)
 
+def _refresh_token():
+    # On failure AuthorizedSession just refreshes lazily on the first request
+    try:
+        _CREDS.refresh(Request())
+    except Exception as e:
+        logger.warning("⚠ Background Sheets token refresh failed: %s", e)
+
+# Fetch the OAuth token at import so it is ready by the first upsert; get_sheet joins it
+_TOKEN_REFRESH = threading.Thread(target=_refresh_token, daemon=True)
+_TOKEN_REFRESH.start()
+
+# One authorized client and worksheet handle per process; reused across upserts
+@lru_cache(maxsize=1)
 def get_sheet():
-    creds = Credentials.from_service_account_info(SERVICE_ACCOUNT_INFO, scopes=SCOPES)
-    client = gspread.authorize(creds)
+    _TOKEN_REFRESH.join()
+    # One keep-alive pool shared by every Sheets call in this process
+    session = AuthorizedSession(_CREDS)
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=SHEETS_POOL_SIZE))
+    client = gspread.Client(auth=_CREDS, session=session)
     return client.open_by_key(SPREADSHEET_ID).sheet1  # or worksheet("Radar")
 
+_header_checked = False
+
+def _ensure_header(sheet):
+    """Write the header row if row 1 is empty; checked once per process."""
+    global _header_checked
+    if _header_checked:
+        return
+    # Only the cell values are needed; the fields mask drops the range/majorDimension envelope
+    header = sheet.spreadsheet.values_get(
+        absolute_range_name(sheet.title, "1:1"), params={"fields": "values"}
+    )
+    if not header.get("values"):
+        sheet.update(range_name=f"A1:{LAST_COL}1", values=[HEADER], value_input_option="RAW")
+    _header_checked = True
+
+def _file_version(sheet):
+    """Drive's version counter for the spreadsheet; bumps on every edit."""
+    url = f"{DRIVE_FILES_API_V3_URL}/{sheet.spreadsheet.id}"
+    return int(_request(sheet, "get", url, params={"fields": "version"}).json()["version"])
+
+def _try_file_version(sheet):
+    """
+    The spreadsheet's Drive version, or None when Drive can't be read (API not
+    enabled, scope missing, ...). The version only validates the row index
+    cache, so a failure just means reading the index from the sheet.
+    """
+    try:
+        return _call_with_retry(_file_version, sheet)
+    except (gspread.exceptions.APIError, KeyError, TypeError, ValueError) as e:
+        logger.warning("⚠ Drive version unavailable, not using the sheet index cache: %s", e)
+        return None
+
+def _load_cached_index(sheet, version):
+    try:
+        data = fastjson.loads(INDEX_CACHE_FILE.read_bytes())
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(data, dict)
+        or not isinstance(data.get("index"), dict)
+        or not isinstance(data.get("last_row"), int)
+    ):
+        return None
+    if (data.get("spreadsheet"), data.get("sheet_id"), data.get("version")) != (
+        sheet.spreadsheet.id, sheet.id, version
+    ):
+        return None
+    rows = data.get("rows")
+    return data["index"], rows if isinstance(rows, dict) else {}, data["last_row"]
+
+def _save_cached_index(sheet, version, existing_index, known_rows, last_row):
+    data = {
+        "spreadsheet": sheet.spreadsheet.id,
+        "sheet_id": sheet.id,
+        "version": version,
+        "last_row": last_row,
+        "index": existing_index,
+        # Values as last written by this client, so the next run can send only changed cells
+        "rows": known_rows,
+    }
+    try:
+        INDEX_CACHE_FILE.write_bytes(fastjson.dumpb(data))
+    except OSError as e:
+        logger.warning("⚠ Failed to write sheet index cache: %s", e)
+
+def _drop_cached_index(reason):
+    logger.info("→ Discarding sheet index cache: %s", reason)
+    try:
+        INDEX_CACHE_FILE.unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning("⚠ Failed to remove sheet index cache: %s", e)
+
+def _appended_first_row(resp):
+    """First sheet row written by a values.append response ("'Sheet1'!A7:V9" -> 7)."""
+    updated = resp["updates"]["updatedRange"].rsplit("!", 1)[-1]
+    return a1_range_to_grid_range(updated)["startRowIndex"] + 1
+
+def _read_index(sheet):
+    resp = _call_with_retry(
+        sheet.spreadsheet.values_batch_get,
+        [absolute_range_name(sheet.title, r) for r in KEY_RANGES],
+        params={
+            "majorDimension": "COLUMNS",
+            "valueRenderOption": "UNFORMATTED_VALUE",
+            "fields": "valueRanges(values)",
+        },
+    )
+    id_range, window_range = (vr.get("values") for vr in resp["valueRanges"])
+    ids = id_range[0] if id_range else []
+    windows = window_range[0] if window_range else []
+    existing_index = {
+        f"{seid}{KEY_SEP}{window}": i+2
+        for i, (seid, window) in enumerate(zip_longest(ids, windows, fillvalue=""))
+    }
+    return existing_index, max(existing_index.values(), default=1)
+
+def _append_new_rows(sheet, rows, last_row):
+    """
+    Append rows, retrying on 429/5xx. Appends aren't idempotent (a failed call
+    may still have landed), so before each retry the key columns are re-read
+    and rows the sheet already has are dropped. Returns the append response
+    and whether any retry happened.
+    """
+    for attempt in range(SHEETS_MAX_ATTEMPTS):
+        try:
+            resp = sheet.append_rows(
+                rows, value_input_option="RAW",
+                # last_row bounds the table search so the server doesn't probe from A1
+                table_range=f"A1:{LAST_COL}{last_row}",
+            )
+            return resp, attempt > 0
+        except gspread.exceptions.APIError as e:
+            _backoff_or_raise(e, attempt)
+        present, last_row = _read_index(sheet)
+        rows = [r for r in rows if f"{r[0]}{KEY_SEP}{r[_WINDOW_POS]}" not in present]
+        if not rows:
+            return None, True
+
 def upsert_events(events):
     sheet = get_sheet()
-    rows = sheet.get_all_records()
-    existing_index = {(r["source_event_id"], r["window"]): i+2 for i, r in enumerate(rows)}
+    _ensure_header(sheet)
 
-    now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    # Reuse the last run's row index unless the spreadsheet changed since;
+    # cached cell values are only trusted on a version match
+    version = _try_file_version(sheet)
+    cached = _load_cached_index(sheet, version) if version is not None else None
+    if cached:
+        existing_index, known_rows, last_row = cached
+    else:
+        existing_index, last_row = _read_index(sheet)
+        known_rows = {}
 
-    header = [
-        "source_event_id", "source", "event_name", "artist_primary", "artist_all",
-        "venue", "city", "date", "weekday", "is_weekend", "genre_primary",
-        "onsale_start", "tm_popularity_raw", "venue_tier", "genre_fit",
-        "score_total", "window", "press_contact_name", "press_contact_url",
-        "press_contact_email", "recommended", "last_seen",
-    ]
-    if not rows:
-        sheet.insert_row(header, 1)
+    now = datetime.now(timezone.utc).isoformat(timespec="seconds")
 
+    # Collect every write first, then send the update batches and the append concurrently
+    updates = []
+    new_rows = []
+    # Only rows written this run are cached for the next diff, so the file doesn't grow forever
+    written_rows = {}
+    updates_append = updates.append
+    new_rows_append = new_rows.append
+    get_fields = _ROW_FIELDS
+    get_index = existing_index.get
     for e in events:
-        key = (e["source_event_id"], e["window"])
-        recommended = "TRUE" if e["score_total"] >= 0.8 else "FALSE"
+        fields = get_fields(e)
+        date = fields[_DATE_POS]
+        recommended = "TRUE" if fields[_SCORE_POS] >= 0.8 else "FALSE"
         row = [
-            e["source_event_id"],
-            e["source"],
-            e["event_name"],
-            e["artist_primary"],
-            e["artist_all"],
-            e["venue"],
-            e["city"],
-            e["date"].isoformat() if e["date"] else "",
-            e["weekday"],
-            e["is_weekend"],
-            e["genre_primary"],
-            e["onsale_start"],
-            e["tm_popularity_raw"],
-            e["venue_tier"],
-            e["genre_fit"],
-            e["score_total"],
-            e["window"],
-            e["press_contact_name"],
-            e["press_contact_url"],
-            e["press_contact_email"],
+            *fields[:_DATE_POS],
+            date.isoformat() if date else "",
+            *fields[_DATE_POS + 1:],
             recommended,
             now,
         ]
 
-        if key in existing_index:
-            sheet.update(f"A{existing_index[key]}:W{existing_index[key]}", [row])
+        key = f"{fields[0]}{KEY_SEP}{fields[_WINDOW_POS]}"
+        idx = get_index(key)
+        if idx is not None:
+            for c1, c2 in _changed_spans(known_rows.get(key), row):
+                updates_append((idx, c1, c2, row[c1:c2]))
         else:
-            sheet.append_row(row, value_input_option="RAW")
+            new_rows_append(row)
+        written_rows[key] = row
+
+    # Update batches address absolute rows, so they all finish before the append
+    # runs; the batches themselves go out in parallel
+    futures = [
+        _WRITE_POOL.submit(_call_with_retry, _batch_update_by_data_filter, sheet, chunk)
+        for chunk in _chunks(_coalesce_updates(updates, sheet.id), BATCH_UPDATE_CHUNK)
+    ]
+    done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+    for f in done:
+        f.result()
+    writes = len(futures)
+
+    append_resp = None
+    retried = False
+    if new_rows:
+        append_resp, retried = _append_new_rows(sheet, new_rows, last_row)
+        writes += 1
+
+    if version is None:
+        return
+    # A jump beyond what our own writes explain means someone else edited the sheet
+    # during this run
+    new_version = _try_file_version(sheet)
+    if new_version is None or not 0 <= new_version - version <= writes * DRIVE_VERSION_BUMPS_PER_WRITE:
+        _drop_cached_index("spreadsheet changed during upsert")
+        return
+
+    # Record appended rows where Sheets actually put them
+    if new_rows:
+        if retried:
+            # Some rows may have landed in the failed attempt, at unknown positions
+            _drop_cached_index("append was retried")
+            return
+        first = _appended_first_row(append_resp)
+        if first <= last_row:
+            # Sheets put the new rows inside the table the index describes
+            _drop_cached_index(f"rows appended at row {first}, inside the indexed table")
+            raise RuntimeError(
+                f"Sheets appended {len(new_rows)} rows at row {first}, "
+                f"inside the existing table (rows 2-{last_row})"
+            )
+        for i, row in enumerate(new_rows):
+            existing_index[f"{row[0]}{KEY_SEP}{row[_WINDOW_POS]}"] = first + i
+        last_row = first + len(new_rows) - 1
+    _save_cached_index(sheet, new_version, existing_index, written_rows, last_row)
@@ -0,0 +1,9 @@
+"""
+The project is a set of flat modules run from the repo root; make them
+importable from the tests.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,181 @@
+"""
+Tests for the pure helpers in ai_filter.py (no OpenAI calls).
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+import ai_filter
+from ai_filter import (
+    _SelectionScanner,
+    _load_cached_selections,
+    _save_cached_selections,
+    _select_candidates,
+)
+
+
+RESPONSE = {
+    "selections": {
+        "short_term": [
+            {"id": "A1", "keep": True, "priority": 9, "reason": 'says "hi" {not json} [x]'},
+            {"id": "A2", "keep": False, "priority": 2, "reason": "back\\slash \\\" and }]"},
+        ],
+        "far_out": [
+            {"id": "B1", "keep": True, "priority": 7, "reason": "unicode é — ok"},
+        ],
+        "empty": [],
+    }
+}
+
+
+def _scan(text, size):
+    scanner = _SelectionScanner()
+    items = []
+    for i in range(0, len(text), size):
+        items.extend(scanner.feed(text[i:i + size]))
+    return scanner, items
+
+
+@pytest.mark.parametrize("indent", [None, 1])
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 10_000])
+def test_scanner_matches_json_for_any_chunking(indent, size):
+    text = json.dumps(RESPONSE, indent=indent)
+    scanner, items = _scan(text, size)
+
+    expected = [(label, item) for label, sel in RESPONSE["selections"].items() for item in sel]
+    assert items == expected
+    assert scanner.saw_selections
+    assert scanner.labels == ["short_term", "far_out", "empty"]
+    assert scanner.text == text
+
+
+def test_scanner_handles_escaped_quotes_in_keys():
+    text = json.dumps({"selections": {'we"ird': [{"id": "X", "reason": "\\"}]}})
+    _, items = _scan(text, 1)
+    assert items == [('we"ird', {"id": "X", "reason": "\\"})]
+
+
+def test_scanner_without_selections_section():
+    scanner, items = _scan(json.dumps({"other": {"w": [{"id": "X"}]}}), 5)
+    assert items == []
+    assert not scanner.saw_selections
+
+
+# ---------------------------
+# On-disk response cache
+# ---------------------------
+
+MODEL = "gpt-4o"
+
+
+def _fingerprint(ids, top_k=20):
+    return {"short_term": {"top_k": top_k, "ids": set(ids)}}
+
+
+def _selections(tag):
+    return {"short_term": [{"id": tag, "keep": True, "priority": 5, "reason": "r"}]}
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / ".ai_cache"
+    monkeypatch.setattr(ai_filter, "AI_CACHE_DIR", path)
+    return path
+
+
+def _age(path, seconds):
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+IDS = [f"E{i}" for i in range(20)]
+
+
+def test_cache_exact_hit(cache_dir):
+    _save_cached_selections("k1", MODEL, _fingerprint(IDS), _selections("exact"))
+    assert _load_cached_selections("k1", MODEL, _fingerprint(IDS)) == _selections("exact")
+
+
+def test_cache_miss_without_cache_dir(cache_dir):
+    assert _load_cached_selections("k1", MODEL, _fingerprint(IDS)) is None
+
+
+def test_cache_near_hit_on_similar_candidates(cache_dir):
+    _save_cached_selections("k1", MODEL, _fingerprint(IDS), _selections("near"))
+    # 19 of 21 ids shared: Jaccard 0.905
+    similar = IDS[:-1] + ["NEW"]
+    assert _load_cached_selections("k2", MODEL, _fingerprint(similar)) == _selections("near")
+    # 18 of 22 ids shared: Jaccard 0.818
+    different = IDS[:-2] + ["NEW1", "NEW2"]
+    assert _load_cached_selections("k3", MODEL, _fingerprint(different)) is None
+
+
+def test_cache_near_match_requires_same_model_and_top_k(cache_dir):
+    _save_cached_selections("k1", MODEL, _fingerprint(IDS), _selections("near"))
+    assert _load_cached_selections("k2", "gpt-4o-mini", _fingerprint(IDS)) is None
+    assert _load_cached_selections("k2", MODEL, _fingerprint(IDS, top_k=10)) is None
+
+
+def test_cache_prunes_expired_entries(cache_dir):
+    _save_cached_selections("old", MODEL, _fingerprint(IDS), _selections("old"))
+    _age(cache_dir / "old.json", ai_filter.AI_CACHE_TTL_SECONDS + 60)
+    assert _load_cached_selections("old", MODEL, _fingerprint(IDS)) is None
+    assert not (cache_dir / "old.json").exists()
+
+    _save_cached_selections("old", MODEL, _fingerprint(IDS), _selections("old"))
+    _age(cache_dir / "old.json", ai_filter.AI_CACHE_TTL_SECONDS + 60)
+    # Saving also prunes, since exact hits never run the near-match scan
+    _save_cached_selections("new", MODEL, _fingerprint(["X"]), _selections("new"))
+    assert sorted(p.name for p in cache_dir.iterdir()) == ["new.json"]
+
+
+def test_cache_near_match_scans_only_newest_entries(cache_dir):
+    _save_cached_selections("match", MODEL, _fingerprint(IDS), _selections("match"))
+    _age(cache_dir / "match.json", 3600)
+    for i in range(ai_filter.AI_CACHE_MAX_SCAN):
+        key = f"other{i}"
+        _save_cached_selections(key, MODEL, _fingerprint([f"X{i}"]), _selections(key))
+        _age(cache_dir / f"{key}.json", 60 + i)
+    assert _load_cached_selections("probe", MODEL, _fingerprint(IDS)) is None
+
+    # Once one newer entry expires, the match is back inside the scan window
+    _age(cache_dir / "other0.json", ai_filter.AI_CACHE_TTL_SECONDS + 60)
+    assert _load_cached_selections("probe", MODEL, _fingerprint(IDS)) == _selections("match")
+
+
+# ---------------------------
+# Candidate selection
+# ---------------------------
+
+EVENTS = [{"id": f"E{i:03d}", "score": (i * 37 % 101) / 100} for i in range(150)]
+
+
+def test_select_candidates_head_plus_seeded_wildcards():
+    top_k = 10
+    picked = _select_candidates(EVENTS, "short_term", top_k, max_items=200)
+    head_size = ai_filter.AI_HEAD_FACTOR * top_k
+    assert len(picked) == head_size + top_k
+
+    best = sorted(EVENTS, key=lambda e: e["score"], reverse=True)[:head_size]
+    assert picked[:head_size] == best
+    assert len({e["id"] for e in picked}) == len(picked)
+
+
+def test_select_candidates_is_deterministic_per_label():
+    a = _select_candidates(EVENTS, "short_term", 10, max_items=200)
+    b = _select_candidates([dict(e) for e in EVENTS], "short_term", 10, max_items=200)
+    assert [e["id"] for e in a] == [e["id"] for e in b]
+
+    other = _select_candidates(EVENTS, "far_out", 10, max_items=200)
+    assert other[:30] == a[:30]
+    assert [e["id"] for e in other[30:]] != [e["id"] for e in a[30:]]
+
+
+def test_select_candidates_caps_and_short_lists():
+    assert len(_select_candidates(EVENTS, "short_term", 10, max_items=35)) == 35
+    assert len(_select_candidates(EVENTS, "short_term", 10, max_items=20)) == 20
+    few = EVENTS[:25]
+    assert _select_candidates(few, "short_term", 10, max_items=200) == few
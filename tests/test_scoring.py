@@ -0,0 +1,59 @@
+"""
+Tests that the table-driven scoring helpers match the original if-ladders.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from scoring import DEFAULT_VENUE_WEIGHT, VENUE_TIERS, date_proximity_bonus, venue_weight
+
+
+def _ladder_venue_weight(name):
+    key = (name or "").strip().lower()
+    if not key:
+        return DEFAULT_VENUE_WEIGHT
+    for known, w in VENUE_TIERS.items():
+        if known in key:
+            return w
+    return DEFAULT_VENUE_WEIGHT
+
+
+def _ladder_date_bonus(dt, now):
+    if dt is None:
+        return 0.0
+    delta_days = (dt - now).days
+    if delta_days < 0:
+        return -0.2
+    if delta_days <= 7:
+        return 0.10
+    if delta_days <= 30:
+        return 0.08
+    if delta_days <= 120:
+        return 0.05
+    if delta_days <= 365:
+        return 0.02
+    return 0.0
+
+
+VENUE_NAMES = (
+    [None, "", "   ", "Some Bar Nobody Has Heard Of", "the", "Napa"]
+    + list(VENUE_TIERS)
+    + [f"  {k.upper()}  " for k in VENUE_TIERS]
+    + [f"Live at {k} (Upstairs)" for k in VENUE_TIERS]
+)
+
+
+@pytest.mark.parametrize("name", VENUE_NAMES)
+def test_venue_weight_matches_ladder(name):
+    assert venue_weight(name) == _ladder_venue_weight(name)
+
+
+NOW = datetime(2026, 3, 1, 20, 0, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("offset", [timedelta(seconds=-1), timedelta(seconds=1), None])
+def test_date_bonus_matches_ladder_at_every_day(offset):
+    for days in range(-400, 401):
+        dt = None if offset is None else NOW + timedelta(days=days) + offset
+        assert date_proximity_bonus(dt, now=NOW) == _ladder_date_bonus(dt, NOW), days
@@ -0,0 +1,201 @@
+"""
+Tests for the Sheets diffing helpers and upsert_events against an in-memory worksheet.
+"""
+
+import types
+from datetime import date, datetime, timezone
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def sc():
+    pytest.importorskip("gspread")
+    service_account = pytest.importorskip("google.oauth2.service_account")
+    mp = pytest.MonkeyPatch()
+    mp.setenv("SHEET_ID", "test-spreadsheet")
+    mp.setenv("GOOGLE_CREDS_JSON", "{}")
+    # No real service account: skip key parsing and the import-time token fetch
+    mp.setattr(
+        service_account.Credentials,
+        "from_service_account_info",
+        staticmethod(lambda info, scopes=None: types.SimpleNamespace(refresh=lambda request: None)),
+    )
+    import sheets_client
+    yield sheets_client
+    mp.undo()
+
+
+def _col_index(a1):
+    n = 0
+    for ch in a1:
+        if not ch.isalpha():
+            break
+        n = n * 26 + ord(ch.upper()) - 64
+    return n - 1
+
+
+class _Response:
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+class FakeWorksheet:
+    """Just enough of gspread's Worksheet/Spreadsheet/Client for upsert_events."""
+
+    id = 0
+    title = "Sheet1"
+
+    def __init__(self):
+        self.grid = []
+        self.version = 1
+        self.batches = []
+        self.appends = []
+        self.spreadsheet = self
+        self.client = self
+
+    def request(self, method, url, params=None, json=None, **kwargs):
+        if "drive" in url:
+            return _Response({"version": str(self.version)})
+        self.batches.append(json["data"])
+        for d in json["data"]:
+            g = d["dataFilter"]["gridRange"]
+            for k, values in enumerate(d["values"]):
+                row = self.grid[g["startRowIndex"] + k]
+                row[g["startColumnIndex"]:g["endColumnIndex"]] = values
+        self.version += 1
+        return _Response({})
+
+    def values_get(self, range_name, params=None):
+        return {"values": [self.grid[0]]} if self.grid else {}
+
+    def values_batch_get(self, ranges, params=None):
+        out = []
+        for r in ranges:
+            c = _col_index(r.rsplit("!", 1)[-1])
+            col = [row[c] for row in self.grid[1:]]
+            out.append({"values": [col]} if col else {})
+        return {"valueRanges": out}
+
+    def update(self, range_name=None, values=None, **kwargs):
+        self.grid[:1] = [list(values[0])]
+        self.version += 1
+
+    def append_rows(self, rows, **kwargs):
+        self.appends.append(len(rows))
+        start = len(self.grid) + 1
+        self.grid.extend(list(r) for r in rows)
+        self.version += 1
+        return {"updates": {"updatedRange": f"'Sheet1'!A{start}:V{start + len(rows) - 1}"}}
+
+
+class _FixedDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _event(sc, eid, name):
+    ev = dict.fromkeys(sc.HEADER[:-2], "")
+    ev.update(
+        source_event_id=eid, source="ticketmaster", event_name=name,
+        date=date(2026, 5, 1), score_total=0.5, window="short_term",
+    )
+    return ev
+
+
+def test_changed_spans(sc):
+    old = list("abcdefghij")
+    assert sc._changed_spans(None, old) == [(0, 10)]
+    assert sc._changed_spans(old[:-1], old) == [(0, 10)]
+    assert sc._changed_spans(old, list(old)) == []
+    row = list("aXYdeZghiW")
+    assert sc._changed_spans(old, row) == [(1, 3), (5, 6), (9, 10)]
+
+
+def test_changed_spans_rewrites_mostly_changed_rows(sc):
+    old = [str(i) for i in range(len(sc.HEADER))]
+    row = ["x"] * (sc.WHOLE_ROW_THRESHOLD + 1) + old[sc.WHOLE_ROW_THRESHOLD + 1:]
+    assert sc._changed_spans(old, row) == [(0, len(row))]
+
+
+def test_coalesce_updates_merges_consecutive_rows_with_same_span(sc):
+    updates = [
+        (5, 2, 3, ["c5"]),
+        (3, 2, 3, ["c3"]),
+        (4, 2, 3, ["c4"]),
+        (7, 2, 3, ["c7"]),
+        (4, 0, 2, ["a4", "b4"]),
+    ]
+    ranges = sc._coalesce_updates(updates, sheet_id=9)
+    bounds = [
+        (r["dataFilter"]["gridRange"]["startRowIndex"], r["dataFilter"]["gridRange"]["endRowIndex"],
+         r["dataFilter"]["gridRange"]["startColumnIndex"], r["dataFilter"]["gridRange"]["endColumnIndex"],
+         r["values"])
+        for r in ranges
+    ]
+    assert bounds == [
+        (3, 4, 0, 2, [["a4", "b4"]]),
+        (2, 5, 2, 3, [["c3"], ["c4"], ["c5"]]),
+        (6, 7, 2, 3, [["c7"]]),
+    ]
+    assert all(r["dataFilter"]["gridRange"]["sheetId"] == 9 for r in ranges)
+
+
+def test_upsert_sends_only_changed_cells(sc, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    sheet = FakeWorksheet()
+    monkeypatch.setattr(sc, "get_sheet", lambda: sheet)
+    monkeypatch.setattr(sc, "_header_checked", False)
+    monkeypatch.setattr(sc, "datetime", _FixedDatetime)
+
+    events = [_event(sc, f"E{i}", f"Show {i}") for i in range(3)]
+    sc.upsert_events(events)
+    assert sheet.grid[0] == sc.HEADER
+    assert [row[0] for row in sheet.grid[1:]] == ["E0", "E1", "E2"]
+    assert sheet.appends == [3] and sheet.batches == []
+
+    # Unchanged rows send nothing
+    sc.upsert_events(events)
+    assert sheet.appends == [3] and sheet.batches == []
+
+    # Two adjacent rows change in the same column: one coalesced range, no append
+    events[1]["event_name"] = "Show 1 (late)"
+    events[2]["event_name"] = "Show 2 (late)"
+    sc.upsert_events(events)
+    assert sheet.appends == [3]
+    assert len(sheet.batches) == 1 and len(sheet.batches[0]) == 1
+    name_col = sc.HEADER.index("event_name")
+    sent = sheet.batches[0][0]
+    assert sent["dataFilter"]["gridRange"] == {
+        "sheetId": sheet.id,
+        "startRowIndex": 2, "endRowIndex": 4,
+        "startColumnIndex": name_col, "endColumnIndex": name_col + 1,
+    }
+    assert sent["values"] == [["Show 1 (late)"], ["Show 2 (late)"]]
+    assert [row[name_col] for row in sheet.grid[1:]] == ["Show 0", "Show 1 (late)", "Show 2 (late)"]
+
+
+def test_upsert_rereads_index_when_sheet_changed_elsewhere(sc, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    sheet = FakeWorksheet()
+    monkeypatch.setattr(sc, "get_sheet", lambda: sheet)
+    monkeypatch.setattr(sc, "_header_checked", False)
+    monkeypatch.setattr(sc, "datetime", _FixedDatetime)
+
+    events = [_event(sc, f"E{i}", f"Show {i}") for i in range(2)]
+    sc.upsert_events(events)
+
+    # Someone else edits a cached cell; the cache no longer matches the version
+    name_col = sc.HEADER.index("event_name")
+    sheet.grid[1][name_col] = "edited by hand"
+    sheet.version += 1
+
+    sc.upsert_events(events)
+    assert sheet.appends == [2]
+    # Without trusted cached values every row is rewritten whole
+    assert len(sheet.batches) == 1
+    assert [row[name_col] for row in sheet.grid[1:]] == ["Show 0", "Show 1"]